@@ -2,10 +2,14 @@
 
 import os
 import json
+import functools
+import hashlib
+import tempfile
+import orjson
 import streamlit as st
-import glob
 import re
-from openai import OpenAI
+import tiktoken
+from operator import itemgetter
 from dotenv import load_dotenv
 
 # Load environment variables from .env file
@@ -16,13 +20,99 @@ api_key = os.getenv("OPENAI_API_KEY")
 if not api_key:
     raise ValueError("The OPENAI_API_KEY environment variable is not set.")
 
-client = OpenAI()
+@st.cache_resource
+def get_openai_client():
+    """One OpenAI client (and HTTP connection pool) shared across reruns."""
+    # Imported lazily so reruns that never reach an API call skip the
+    # openai package import cost (cached in sys.modules afterwards).
+    import httpx
+    from openai import OpenAI
+    # Explicit keep-alive pool so the TLS handshake is paid once per
+    # process, not once per idle-expired turn.
+    return OpenAI(
+        http_client=httpx.Client(
+            timeout=30,
+            limits=httpx.Limits(max_keepalive_connections=10, keepalive_expiry=60),
+        )
+    )
+
+client = get_openai_client()
+
+# Prompt-side token budget; leaves headroom in the context window for the
+# model's response.
+TOKEN_BUDGET = 6000
+
+@functools.lru_cache(maxsize=1)
+def _get_encoder():
+    return tiktoken.encoding_for_model("gpt-4")
+
+# Sliding history window: the last K turn units. Older turns never reach
+# the API, so per-turn prompt size (and prefill cost) stays bounded
+# instead of growing with conversation length.
+_HISTORY_WINDOW = 8
+
+def _fit_budget(messages, max_tokens=TOKEN_BUDGET):
+    """
+    Trim conversation history to a rolling token window.
+
+    Preserves the system prompt, the greeting, and the injected bill
+    context at the front, caps the rest at the last _HISTORY_WINDOW turn
+    units, then drops the oldest remaining units until the request fits
+    the budget. A unit is one message plus any tool results attached to
+    it, so trimming can never strand a tool message without the
+    assistant turn that issued its call.
+    """
+    head, tail = messages[:3], messages[3:]
+
+    units = []
+    for msg in tail:
+        if msg["role"] == "tool" and units:
+            units[-1].append(msg)
+        else:
+            units.append([msg])
+
+    # Length cap first — units outside the window are dropped without
+    # ever being encoded. Only the in-window messages (a dozen or so)
+    # are encoded, which is cheap enough to redo each turn.
+    if len(units) > _HISTORY_WINDOW:
+        units = units[-_HISTORY_WINDOW:]
+
+    enc = _get_encoder()
+    total = sum(len(enc.encode(msg["content"] or "")) for msg in head)
+    counts = [
+        sum(len(enc.encode(msg["content"] or "")) for msg in unit)
+        for unit in units
+    ]
+
+    # Drop the oldest units until the request fits; the final unit — the
+    # turn being answered — always stays.
+    total += sum(counts)
+    while total > max_tokens and len(units) > 1:
+        total -= counts.pop(0)
+        units.pop(0)
+    return head + [msg for unit in units for msg in unit]
+
+def canonical_phone(phone_number):
+    """Canonical form of a phone number: no surrounding space, no leading 0."""
+    return phone_number.strip().lstrip("0")
+
+@functools.lru_cache(maxsize=1)
+def _load_db_cached(mtime_ns):
+    with open("data/customer_database.json", "rb") as file:
+        db = orjson.loads(file.read())
+    # Re-key customers on the canonical number once at load time, so
+    # lookups never need to try both spellings.
+    db["customers"] = {
+        canonical_phone(number): info for number, info in db.get("customers", {}).items()
+    }
+    return db
 
 def load_customer_database():
     """Load the mock customer database to validate phone numbers."""
     try:
-        with open("data/customer_database.json", "r") as file:
-            return json.load(file)
+        # Keyed on mtime so repeated validations reuse the parsed dict and
+        # an edited database file still invalidates the cache.
+        return _load_db_cached(os.stat("data/customer_database.json").st_mtime_ns)
     except FileNotFoundError:
         return {"customers": {}}
 
@@ -32,59 +122,97 @@ def validate_customer(phone_number):
     Accepts phone numbers with or without leading "0".
     Returns customer info if valid, None if invalid.
     """
-    db = load_customer_database()
-    customers = db.get("customers", {})
-    
-    # Remove any leading "0" to normalize the format
-    normalized_number = phone_number.lstrip("0")
-    
-    # Try both the original number and normalized number
-    return customers.get(phone_number) or customers.get(normalized_number)
+    # The database is keyed canonically at load time: one lookup.
+    return load_customer_database().get("customers", {}).get(canonical_phone(phone_number))
 
 def reset_chat_session():
     """Reset the entire chat session for a new customer."""
+    # Only the current customer's file matters; grab the id before the
+    # session state is cleared.
+    user_id = st.session_state.get('user_id')
+
     # Clear all session state related to user and conversation
-    keys_to_clear = ['user_id', 'customer_info', 'messages', 'context_prompt_added', 'customer_validated']
+    keys_to_clear = ['user_id', 'customer_info', 'messages', 'context_prompt_added', 'customer_validated', 'bills_snapshot']
     for key in keys_to_clear:
         if key in st.session_state:
             del st.session_state[key]
-    
-    # Clean up user data files (optional - for demo purposes)
-    user_data_pattern = os.path.join("data", "user_data", "user_data_*.json")
-    user_data_files = glob.glob(user_data_pattern)
-    for file_path in user_data_files:
+
+    # Clean up this customer's data file (optional - for demo purposes);
+    # no directory-wide glob scan.
+    if user_id:
+        file_path = os.path.join("data", "user_data", f"user_data_{user_id}.json")
         try:
             os.remove(file_path)
         except OSError:
             pass
 
-def load_user_data(user_id):
+@st.cache_data(show_spinner=False)
+def _load_user_data_cached(file_path, mtime_ns, size):
+    """Parse a user-data file once per (path, mtime, size) snapshot."""
+    # orjson wants bytes; it parses the nested bill dicts several times
+    # faster than stdlib json.
+    with open(file_path, "rb") as file:
+        return orjson.loads(file.read())
+
+def _user_data_key(user_id):
+    """(path, mtime_ns, size) cache key for a user-data file, or None."""
     file_path = os.path.join("data", "user_data", f"user_data_{user_id}.json")
-    if not os.path.exists(file_path):
+    try:
+        st_info = os.stat(file_path)
+    except FileNotFoundError:
+        return None
+    return file_path, st_info.st_mtime_ns, st_info.st_size
+
+def load_user_data(user_id):
+    # Keyed on mtime+size so unchanged files are never re-parsed across
+    # Streamlit reruns; any rewrite produces a new key.
+    key = _user_data_key(user_id)
+    if key is None:
         return {}
-    with open(file_path, "r") as file:
-        return json.load(file)
+    return _load_user_data_cached(*key)
+
+@functools.lru_cache(maxsize=32)
+def _bill_keys_cached(file_path, mtime_ns, size):
+    """Union of bill keys for one user-data snapshot, computed once."""
+    user_data = _load_user_data_cached(file_path, mtime_ns, size)
+    return frozenset(key for bill in user_data.get("bills", []) for key in bill)
+
+# Whether data/user_data is known to exist; lets warm saves skip the
+# makedirs syscall after the first one creates it.
+_USER_DATA_DIR_READY = False
 
 def save_user_data(user_id, data):
+    global _USER_DATA_DIR_READY
     file_path = os.path.join("data", "user_data", f"user_data_{user_id}.json")
-    os.makedirs(os.path.dirname(file_path), exist_ok=True)
-    with open(file_path, "w") as file:
-        json.dump(data, file)
-
-def check_duplicate_bill(existing_bills, new_bill):
+    if not _USER_DATA_DIR_READY:
+        os.makedirs(os.path.dirname(file_path), exist_ok=True)
+        _USER_DATA_DIR_READY = True
+    # Precompute the lowercased key index once per save so per-query
+    # keyword matching doesn't rescan every bill, and the (billNo,
+    # billDate) index so duplicate checks are hash lookups.
+    data["_keysLower"] = sorted({k.lower() for bill in data.get("bills", []) for k in bill})
+    data["_billKey"] = [[bill.get("billNo"), bill.get("billDate")] for bill in data.get("bills", [])]
+    # Write to a temp file and rename so a crash mid-write can't corrupt
+    # the user's bill history; orjson serializes the nested dicts far
+    # faster than stdlib json.
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(file_path))
+    try:
+        with os.fdopen(fd, "wb") as file:
+            file.write(orjson.dumps(data))
+        os.replace(tmp_path, file_path)
+    except OSError:
+        os.unlink(tmp_path)
+        raise
+    # Drop stale cache entries so the next load re-reads the new file.
+    _load_user_data_cached.clear()
+    _bill_keys_cached.cache_clear()
+
+def check_duplicate_bill(bill_index, new_bill):
     """
     Check if a bill is a duplicate based on billNo and billDate.
-    Returns True if duplicate found, False otherwise.
+    bill_index is a set of (billNo, billDate) tuples; the lookup is O(1).
     """
-    new_bill_no = new_bill.get("billNo")
-    new_bill_date = new_bill.get("billDate")
-    
-    for existing_bill in existing_bills:
-        if (existing_bill.get("billNo") == new_bill_no and 
-            existing_bill.get("billDate") == new_bill_date):
-            return True
-    
-    return False
+    return (new_bill.get("billNo"), new_bill.get("billDate")) in bill_index
 
 def load_available_bills(customer_info):
     """Load available bills for a validated customer from the file system."""
@@ -92,8 +220,8 @@ def load_available_bills(customer_info):
     for bill_id in customer_info.get("availableBills", []):
         bill_file = f"data/bill_{bill_id}.json"
         try:
-            with open(bill_file, "r") as f:
-                bill_data = json.load(f)
+            with open(bill_file, "rb") as f:
+                bill_data = orjson.loads(f.read())
                 parsed_bill = parseBill(bill_data)
                 parsed_bill["bill_id"] = bill_id  # Add bill ID for reference
                 bills.append(parsed_bill)
@@ -101,24 +229,32 @@ def load_available_bills(customer_info):
             st.warning(f"Bill file {bill_file} not found for customer")
     return bills
 
+# Tax items always carry cat/amt; fetching both per item with a bound
+# itemgetter avoids two dict.get calls per entry in the hot loop.
+_get_cat_amt = itemgetter("cat", "amt")
+
 def parseBill(data):
-    billDate = data.get("billDate")
-    billNo = data.get("billNo")
-    amountDue = data.get("amountDue")
-    extraCharge = data.get("extraCharge")
-    taxItems = data.get("taxItem", [])
-    subscribers = data.get("subscribers", [])
-
-    totalBillCosts = [{"categorie": t.get("cat"), "amount": t.get("amt")} for t in taxItems]
+    get = data.get
+    billDate = get("billDate")
+    billNo = get("billNo")
+    amountDue = get("amountDue")
+    extraCharge = get("extraCharge")
+    taxItems = get("taxItem", [])
+    subscribers = get("subscribers", [])
+
+    totalBillCosts = [
+        {"categorie": cat, "amount": amt} for cat, amt in map(_get_cat_amt, taxItems)
+    ]
     subscriberCosts = []
+    append_subscriber = subscriberCosts.append
     for sub in subscribers:
-        logicalResource = sub.get("logicalResource")
-        billSummaryItems = sub.get("billSummaryItem", [])
-        subscriberCosts.append({
-            "logicalResource": logicalResource,
+        sub_get = sub.get
+        append_subscriber({
+            "logicalResource": sub_get("logicalResource"),
             "billSummaryItems": [
+                # "name" is optional on summary items, so .get stays here.
                 {"categorie": bsi.get("cat"), "amount": bsi.get("amt"), "name": bsi.get("name")}
-                for bsi in billSummaryItems
+                for bsi in sub_get("billSummaryItem", [])
             ],
         })
 
@@ -131,146 +267,329 @@ def parseBill(data):
         "subscriberCosts": subscriberCosts
     }
 
+# Short aliases for the verbose parsed-bill keys; the legend is included
+# once in the system context so the model can map them back.
+ALIAS = {
+    "billDate": "date",
+    "billNo": "no",
+    "amountDue": "due",
+    "extraCharge": "extra",
+    "totalBillCosts": "tax",
+    "subscriberCosts": "subs",
+    "billSummaryItems": "items",
+    "logicalResource": "res",
+    "categorie": "cat",
+    "amount": "amt",
+}
+
+_ALIAS_LEGEND = ", ".join(f"{short}={long}" for long, short in ALIAS.items())
+
+def _compact_bills(value):
+    """Recursively rewrite parsed bills with short keys to cut prompt tokens."""
+    if isinstance(value, dict):
+        return {ALIAS.get(k, k): _compact_bills(v) for k, v in value.items()}
+    if isinstance(value, list):
+        return [_compact_bills(v) for v in value]
+    return value
+
+@functools.lru_cache(maxsize=32)
+def _related_keys_pattern(keys_lower):
+    # Longest-first so keys that prefix other keys don't shadow them in
+    # the alternation.
+    ordered = sorted(keys_lower, key=len, reverse=True)
+    return re.compile("|".join(map(re.escape, ordered)))
+
 def check_related_keys(question, user_id):
-    user_data = load_user_data(user_id)
-    bill_keys = set()
-    for bill in user_data.get("bills", []):
-        bill_keys.update(bill.keys())
-    return [key for key in bill_keys if key.lower() in question.lower()]
+    key = _user_data_key(user_id)
+    if key is None:
+        return []
+    user_data = _load_user_data_cached(*key)
+    keys_lower = user_data.get("_keysLower")
+    if keys_lower is None:
+        # Files saved before the index existed: derive it from the bills.
+        keys_lower = sorted(k.lower() for k in _bill_keys_cached(*key))
+    # Lowercase the question once instead of per key inside the comprehension.
+    q_lower = question.lower()
+    if len(keys_lower) <= 8:
+        # Common case: a handful of keys, plain substring checks win.
+        return [k for k in keys_lower if k in q_lower]
+    # Many keys: one compiled-alternation scan over the question instead
+    # of one substring scan per key.
+    hits = set(_related_keys_pattern(tuple(keys_lower)).findall(q_lower))
+    return [k for k in keys_lower if k in hits]
+
+# Tool schema letting the model fetch bill fields on demand instead of
+# receiving the full bill JSON in every prompt.
+BILL_TOOLS = [
+    {
+        "type": "function",
+        "function": {
+            "name": "get_bill_field",
+            "description": (
+                "Look up a field from the user's parsed telecom bills. "
+                "Use bill_index -1 for the latest bill."
+            ),
+            "parameters": {
+                "type": "object",
+                "properties": {
+                    "key": {
+                        "type": "string",
+                        "description": "Bill field name, e.g. amountDue, billDate, totalBillCosts",
+                    },
+                    "bill_index": {
+                        "type": "integer",
+                        "description": "Index into the bill list; -1 is the latest bill",
+                    },
+                },
+                "required": ["key"],
+            },
+        },
+    }
+]
+
+def _lookup_bill_field(user_id, key, bill_index=-1):
+    """Resolve a get_bill_field tool call against the locally stored bills."""
+    bills = load_user_data(user_id).get("bills", [])
+    if not bills:
+        return {"error": "no bills on file"}
+    try:
+        bill = bills[bill_index]
+    except IndexError:
+        return {"error": f"bill_index {bill_index} out of range ({len(bills)} bills on file)"}
+    if key not in bill:
+        return {"error": f"unknown key '{key}'", "available_keys": sorted(bill)}
+    return {key: bill[key], "billNo": bill.get("billNo"), "billDate": bill.get("billDate")}
+
+def _stream_turn(model_name, messages, user_id, usage_out):
+    """
+    Generator yielding response text chunks for st.write_stream.
+
+    Resolves get_bill_field tool calls between streamed completions and
+    records the final completion's token usage in usage_out.
+    """
+    while True:
+        stream = client.chat.completions.create(
+            model=model_name,
+            messages=_fit_budget(messages),
+            tools=BILL_TOOLS,
+            stream=True,
+            stream_options={"include_usage": True},
+        )
+        tool_calls = {}
+        finish_reason = None
+        for chunk in stream:
+            if chunk.usage:
+                usage_out["usage"] = chunk.usage
+            if not chunk.choices:
+                continue
+            choice = chunk.choices[0]
+            if choice.finish_reason:
+                finish_reason = choice.finish_reason
+            delta = choice.delta
+            if delta.tool_calls:
+                # Tool calls arrive as fragments; reassemble them by index.
+                for tc in delta.tool_calls:
+                    entry = tool_calls.setdefault(
+                        tc.index,
+                        {"id": tc.id, "type": "function", "function": {"name": "", "arguments": ""}},
+                    )
+                    if tc.id:
+                        entry["id"] = tc.id
+                    if tc.function.name:
+                        entry["function"]["name"] = tc.function.name
+                    if tc.function.arguments:
+                        entry["function"]["arguments"] += tc.function.arguments
+            elif delta.content:
+                yield delta.content
+
+        if finish_reason != "tool_calls":
+            return
+
+        calls = [tool_calls[i] for i in sorted(tool_calls)]
+        messages.append({"role": "assistant", "content": None, "tool_calls": calls})
+        for call in calls:
+            args = json.loads(call["function"]["arguments"] or "{}")
+            result = _lookup_bill_field(user_id, args.get("key", ""), args.get("bill_index", -1))
+            messages.append({
+                "role": "tool",
+                "tool_call_id": call["id"],
+                "content": orjson.dumps(result).decode(),
+            })
+
+# Intent keyword patterns, split once at import into plain literals and
+# real regexes so the per-query work is C-level substring checks plus a
+# handful of compiled Pattern.search calls.
+_RAW_INTENTS = {
+    "bill_comparison": [
+        r"compar[ei]", r"difference", r"vs", r"versus", r"between",
+        r"last.*bill", r"previous.*bill", r"month.*month", r"trend"
+    ],
+    "cost_breakdown": [
+        r"breakdown", r"detail", r"explain.*cost", r"what.*charge",
+        r"why.*pay", r"itemize", r"service.*cost"
+    ],
+    "payment_inquiry": [
+        r"pay", r"due", r"amount", r"total", r"balance", r"owe",
+        r"payment", r"outstanding"
+    ],
+    "service_analysis": [
+        r"service", r"subscription", r"plan", r"package", r"feature",
+        r"addon", r"extra", r"usage"
+    ],
+    "discount_inquiry": [
+        r"discount", r"promotion", r"reduction", r"promo", r"offer",
+        r"save", r"cheaper"
+    ],
+    "device_charges": [
+        r"device", r"phone", r"smartphone", r"terminal", r"installment",
+        r"rate.*terminal", r"equipment"
+    ],
+    "general_question": [
+        r"help", r"explain", r"understand", r"what.*is", r"how.*work"
+    ]
+}
+
+_INTENT_SIZES = {intent: len(patterns) for intent, patterns in _RAW_INTENTS.items()}
+
+# Plain-literal keywords score via substring containment — the same
+# semantics as the original re.search, so "discount" still matches
+# "discounts" and "pay" matches "payments". Patterns with real regex
+# syntax (character classes, .* gaps) are compiled once. Each pattern
+# contributes at most one point, as before.
+_INTENT_LITERALS = {}
+_INTENT_REGEXES = {}
+for _intent, _patterns in _RAW_INTENTS.items():
+    _INTENT_LITERALS[_intent] = tuple(p for p in _patterns if p.isalnum())
+    _INTENT_REGEXES[_intent] = tuple(
+        re.compile(p) for p in _patterns if not p.isalnum()
+    )
 
 def detect_user_intent(query):
     """
     Detect the user's intent from their query to customize LLM context.
     Returns intent type and confidence level.
     """
-    query_lower = query.lower()
-    
-    # Define intent patterns
-    intents = {
-        "bill_comparison": [
-            r"compar[ei]", r"difference", r"vs", r"versus", r"between", 
-            r"last.*bill", r"previous.*bill", r"month.*month", r"trend"
-        ],
-        "cost_breakdown": [
-            r"breakdown", r"detail", r"explain.*cost", r"what.*charge", 
-            r"why.*pay", r"itemize", r"service.*cost"
-        ],
-        "payment_inquiry": [
-            r"pay", r"due", r"amount", r"total", r"balance", r"owe", 
-            r"payment", r"outstanding"
-        ],
-        "service_analysis": [
-            r"service", r"subscription", r"plan", r"package", r"feature", 
-            r"addon", r"extra", r"usage"
-        ],
-        "discount_inquiry": [
-            r"discount", r"promotion", r"reduction", r"promo", r"offer", 
-            r"save", r"cheaper"
-        ],
-        "device_charges": [
-            r"device", r"phone", r"smartphone", r"terminal", r"installment", 
-            r"rate.*terminal", r"equipment"
-        ],
-        "general_question": [
-            r"help", r"explain", r"understand", r"what.*is", r"how.*work"
-        ]
-    }
-    
+    q_lower = query.lower()
+
     detected_intents = {}
-    
-    for intent, patterns in intents.items():
-        score = 0
-        for pattern in patterns:
-            if re.search(pattern, query_lower):
-                score += 1
+    for intent, literals in _INTENT_LITERALS.items():
+        score = sum(1 for keyword in literals if keyword in q_lower)
+        score += sum(1 for pattern in _INTENT_REGEXES[intent] if pattern.search(q_lower))
         if score > 0:
             detected_intents[intent] = score
-    
+
     # Return the intent with highest score, or general_question if none detected
     if detected_intents:
-        primary_intent = max(detected_intents.keys(), key=lambda k: detected_intents[k])
-        confidence = detected_intents[primary_intent] / len(intents[primary_intent])
+        primary_intent = max(detected_intents, key=detected_intents.get)
+        confidence = detected_intents[primary_intent] / _INTENT_SIZES[primary_intent]
         return primary_intent, confidence
     else:
         return "general_question", 0.5
 
-def build_intent_context(intent, query, bill_info, related_keys_str):
+_BASE_INSTRUCTION = "You are a helpful telecom billing assistant. Always respond in English, even when the billing data contains Romanian text."
+
+# Conversation openers, built once at import. The dicts are never mutated
+# after creation, so every session can share them; starting a session
+# only copies the list.
+_SYSTEM_MSG = {"role": "system", "content": "You are a helpful telecom billing assistant. Always respond in English, even when the billing data contains Romanian text. Explain telecom charges, compare bills, and help users understand their billing information."}
+_GREETING = {"role": "assistant", "content": "How can I help you with your telecom bill?"}
+_INITIAL_MESSAGES = [_SYSTEM_MSG, _GREETING]
+
+# Pre-formatted once at import; process_query previously rebuilt all seven
+# f-strings on every call.
+_INTENT_INSTRUCTIONS = {
+    "bill_comparison": (
+        f"{_BASE_INSTRUCTION} The user wants to compare bills. "
+        f"Focus on identifying trends, differences in amounts, new charges, or changes in services. "
+        f"Compare multiple bills chronologically and highlight significant changes."
+    ),
+    "cost_breakdown": (
+        f"{_BASE_INSTRUCTION} The user wants a detailed breakdown of costs. "
+        f"Explain each charge category, what services they represent, and provide clear itemization. "
+        f"Translate Romanian billing terms to English explanations."
+    ),
+    "payment_inquiry": (
+        f"{_BASE_INSTRUCTION} The user is asking about payment amounts. "
+        f"Focus on total amounts due, payment dates, outstanding balances, and payment history."
+    ),
+    "service_analysis": (
+        f"{_BASE_INSTRUCTION} The user wants to understand their services. "
+        f"Explain subscriptions, plans, features, and service usage. Focus on what services they have and how they're being charged."
+    ),
+    "discount_inquiry": (
+        f"{_BASE_INSTRUCTION} The user is asking about discounts and promotions. "
+        f"Identify all reductions, promotional offers, and savings. Explain what each discount applies to."
+    ),
+    "device_charges": (
+        f"{_BASE_INSTRUCTION} The user is asking about device-related charges. "
+        f"Focus on installment payments, device costs, terminal charges, and equipment fees."
+    ),
+    "general_question": (
+        f"{_BASE_INSTRUCTION} Provide a comprehensive overview of the billing information to help answer the user's question."
+    )
+}
+
+def build_intent_context(intent, bill_info, related_keys_str):
     """
-    Build specialized context prompts based on detected intent.
+    Build a specialized system-context message based on detected intent.
     """
-    base_instruction = "You are a helpful telecom billing assistant. Always respond in English, even when the billing data contains Romanian text."
-    
-    intent_instructions = {
-        "bill_comparison": (
-            f"{base_instruction} The user wants to compare bills. "
-            f"Focus on identifying trends, differences in amounts, new charges, or changes in services. "
-            f"Compare multiple bills chronologically and highlight significant changes."
-        ),
-        "cost_breakdown": (
-            f"{base_instruction} The user wants a detailed breakdown of costs. "
-            f"Explain each charge category, what services they represent, and provide clear itemization. "
-            f"Translate Romanian billing terms to English explanations."
-        ),
-        "payment_inquiry": (
-            f"{base_instruction} The user is asking about payment amounts. "
-            f"Focus on total amounts due, payment dates, outstanding balances, and payment history."
-        ),
-        "service_analysis": (
-            f"{base_instruction} The user wants to understand their services. "
-            f"Explain subscriptions, plans, features, and service usage. Focus on what services they have and how they're being charged."
-        ),
-        "discount_inquiry": (
-            f"{base_instruction} The user is asking about discounts and promotions. "
-            f"Identify all reductions, promotional offers, and savings. Explain what each discount applies to."
-        ),
-        "device_charges": (
-            f"{base_instruction} The user is asking about device-related charges. "
-            f"Focus on installment payments, device costs, terminal charges, and equipment fees."
-        ),
-        "general_question": (
-            f"{base_instruction} Provide a comprehensive overview of the billing information to help answer the user's question."
-        )
-    }
-    
-    instruction = intent_instructions.get(intent, intent_instructions["general_question"])
-    
+    instruction = _INTENT_INSTRUCTIONS.get(intent, _INTENT_INSTRUCTIONS["general_question"])
+
+    # Keep only a short bill summary plus the compact latest bill in the
+    # prompt; the model fetches older bills and individual fields on demand
+    # through the get_bill_field tool.
+    keys = sorted({k for bill in bill_info for k in bill})
+    dates = [b.get("billDate") for b in bill_info if b.get("billDate")]
+    # Sorted keys keep the serialization byte-identical across turns for
+    # the same bill, which is what lets the provider's prompt prefix
+    # cache keep hitting.
+    latest = (
+        orjson.dumps(_compact_bills(bill_info[-1]), option=orjson.OPT_SORT_KEYS).decode()
+        if bill_info else "{}"
+    )
+
+    context = (
+        f"{instruction} "
+        f"The user has {len(bill_info)} bill(s) on file in RON, dated: {', '.join(dates)}. "
+        f"Available bill fields: {', '.join(keys)}. "
+        f"Latest bill (key legend: {_ALIAS_LEGEND}): {latest} "
+        f"Use the get_bill_field tool to read fields from any bill."
+    )
     if related_keys_str != "N/A":
-        context = (
-            f"{instruction} "
-            f"Read the billing cost information in RON from this JSON: {bill_info} "
-            f"and answer the question: '{query}' but only with information related to: {related_keys_str}. "
-            f"Please respond in English."
-        )
-    else:
-        context = (
-            f"{instruction} "
-            f"Read the billing cost information in RON from this JSON: {bill_info} "
-            f"and answer the question: '{query}' but only with information related to the bill. "
-            f"Please respond in English."
-        )
-    
+        context += f" Answer only with information related to: {related_keys_str}."
+    context += " Please respond in English."
+
     return context
 
 def process_query(query, user_id, model_name):
     user_data = load_user_data(user_id)
     bill_info = user_data.get("bills", [])
+
+    # Budget check first: the serialized bill payload dominates the
+    # prompt, so measure it (with the cached encoder) and drop the oldest
+    # bills before spending any keyword/intent work on an over-budget
+    # request, instead of building the full context only to rebuild it.
+    enc = _get_encoder()
+    while bill_info:
+        payload = orjson.dumps(_compact_bills(bill_info)).decode()
+        if len(enc.encode(payload)) <= TOKEN_BUDGET:
+            break
+        bill_info = bill_info[1:]
+
     related_keys = check_related_keys(query, user_id)
     related_keys_str = ", ".join(related_keys) if related_keys else "N/A"
 
     # ENHANCED INTENT DETECTION
     intent, confidence = detect_user_intent(query)
     st.write(f"Detected Intent: {intent} (confidence: {confidence:.2f})")
-    
-    # Build context based on detected intent
-    context = build_intent_context(intent, query, bill_info, related_keys_str)
 
-    max_input_length = 5550
-    st.write(f"Context:\n{context}")
-    st.write(f"Context size: {len(context)} characters")
+    # Build context based on detected intent
+    context = build_intent_context(intent, bill_info, related_keys_str)
 
-    if len(context) > max_input_length:
-        st.warning("Too many characters in context, the request will not be sent.")
-        return None
+    n_tokens = len(enc.encode(context))
+    # One st.write instead of two — each call is a separate websocket
+    # message to the frontend.
+    st.write(f"Context:\n{context}\n\nContext size: {n_tokens} tokens")
 
     # Update this part to run the chosen model
     if model_name == "gpt-4o-mini":
@@ -282,41 +601,83 @@ def process_query(query, user_id, model_name):
 
     return context
 
+# Quick action buttons and the canned question each one asks. One table
+# drives all the buttons so the handler logic exists exactly once.
+QUICK_ACTIONS = [
+    ("💰 Show Total Amount", "What is the total amount due on my latest bill?"),
+    ("📊 Compare Bills", "Compare my bills and show me the differences between them."),
+    ("🔍 Cost Breakdown", "Give me a detailed breakdown of all charges on my bill."),
+    ("📱 Device Charges", "Show me all device-related charges and installments on my bills."),
+    ("🎯 Discounts & Promotions", "What discounts and promotions are applied to my bills?"),
+    ("📈 Usage Analysis", "Analyze my service usage and explain what I'm paying for."),
+]
+
+def _ensure_bill_context(question, user_id, model_name):
+    """
+    Keep the bill-context system message pinned at index 1.
+
+    The message is rebuilt only when the user's bill snapshot changes;
+    otherwise the exact same object is resent every turn, so the prompt
+    prefix [system, bill context, greeting, ...] stays byte-identical
+    and the provider's prefix cache keeps hitting.
+    """
+    snapshot = _user_data_key(user_id)
+    if st.session_state.context_prompt_added and st.session_state.get("bills_snapshot") == snapshot:
+        return
+    context_msg = process_query(question, user_id, model_name)
+    entry = {"role": "system", "content": context_msg}
+    if st.session_state.context_prompt_added:
+        # Replace the stale context in place instead of stacking a second
+        # system message.
+        st.session_state["messages"][1] = entry
+    else:
+        st.session_state["messages"].insert(1, entry)
+        st.session_state.context_prompt_added = True
+    st.session_state["bills_snapshot"] = snapshot
+
 def process_quick_action(question, user_id, model_name="gpt-4"):
     """Process a quick action question and get AI response."""
-    # Add the question to the conversation
+    _ensure_bill_context(question, user_id, model_name)
+
+    # User turns carry only the raw question
     st.session_state["messages"].append({"role": "user", "content": question})
-    
-    # If context hasn't been added yet, process the query to add context
-    if not st.session_state.context_prompt_added:
-        final_prompt = process_query(question, user_id, model_name)
-        if final_prompt is None:
-            return
-        # Replace the last message with the context-enhanced version
-        st.session_state["messages"][-1] = {"role": "user", "content": final_prompt}
-        st.session_state.context_prompt_added = True
-    
-    # Call OpenAI API
+
+    # Quick actions are canned questions, so a repeat click against the
+    # same bill snapshot can reuse the previous answer instead of paying
+    # for another round trip. Kept in session state rather than on disk —
+    # answers shouldn't outlive the session or leak between customers.
+    cache = st.session_state.setdefault("quick_action_cache", {})
+    cache_key = hashlib.sha256(
+        orjson.dumps([model_name, question, _user_data_key(user_id)])
+    ).hexdigest()
+    cached = cache.get(cache_key)
+    if cached is not None:
+        st.chat_message("assistant").write(cached)
+        st.session_state["messages"].append({"role": "assistant", "content": cached})
+        return
+
+    # Call OpenAI API, streaming tokens into the chat as they arrive
     try:
-        completion = client.chat.completions.create(
-            model=model_name,
-            messages=st.session_state["messages"]
+        usage_box = {}
+        response_text = st.chat_message("assistant").write_stream(
+            _stream_turn(model_name, st.session_state["messages"], user_id, usage_box)
         )
-        response_text = completion.choices[0].message.content.strip()
-        
+
         # Add the response to the conversation
         st.session_state["messages"].append({"role": "assistant", "content": response_text})
-        
+        cache[cache_key] = response_text
+
         # Show model and token usage in sidebar
-        if hasattr(completion, "usage"):
+        usage = usage_box.get("usage")
+        if usage:
             st.sidebar.markdown("---")
             st.sidebar.subheader("🤖 Current Model")
             st.sidebar.write(f"**Model:** {model_name}")
             st.sidebar.subheader("🔢 Token Usage")
-            st.sidebar.write(f"Prompt: {completion.usage.prompt_tokens}")
-            st.sidebar.write(f"Completion: {completion.usage.completion_tokens}")
-            st.sidebar.write(f"Total: {completion.usage.total_tokens}")
-            
+            st.sidebar.write(f"Prompt: {usage.prompt_tokens}")
+            st.sidebar.write(f"Completion: {usage.completion_tokens}")
+            st.sidebar.write(f"Total: {usage.total_tokens}")
+
     except Exception as e:
         st.error(f"❌ Error calling OpenAI API: {str(e)}")
 
@@ -350,22 +711,24 @@ def main():
         st.header("📞 Customer Validation")
         st.info("Enter your phone number to access your billing information.")
         
-        col1, col2 = st.columns([3, 1])
-        with col1:
-            phone_number = st.text_input("Phone Number:", placeholder="e.g., 727723137 or 0727723137", key="phone_input")
-        with col2:
-            st.write("")
-            st.write("")  # Add spacing
-            validate_btn = st.button("Validate", type="primary")
+        # A form batches the text input and button into a single rerun on
+        # submit, instead of one full script rerun per widget interaction.
+        with st.form("customer_validation"):
+            col1, col2 = st.columns([3, 1])
+            with col1:
+                phone_number = st.text_input("Phone Number:", placeholder="e.g., 727723137 or 0727723137", key="phone_input")
+            with col2:
+                st.write("")
+                st.write("")  # Add spacing
+                validate_btn = st.form_submit_button("Validate", type="primary")
 
         if validate_btn and phone_number:
             customer_info = validate_customer(phone_number)
             if customer_info:
                 st.session_state.customer_validated = True
                 st.session_state.customer_info = customer_info
-                # Store the normalized number (without leading 0)
-                normalized_number = phone_number.lstrip("0")
-                st.session_state.user_id = normalized_number
+                # Store the canonical number (without leading 0)
+                st.session_state.user_id = canonical_phone(phone_number)
                 st.success(f"✅ Welcome {customer_info['name']}! Customer validation successful.")
                 st.info(f"Plan: {customer_info['plan']} | Status: {customer_info['status']}")
                 st.rerun()
@@ -408,9 +771,8 @@ def main():
         if st.button("🗑️ Clear All Bills"):
             empty_data = {"bills": []}
             save_user_data(st.session_state.user_id, empty_data)
-            # Clear conversation context when bills are cleared
-            if "context_prompt_added" in st.session_state:
-                del st.session_state["context_prompt_added"]
+            # The bill snapshot changed, so the next turn rebuilds the
+            # context message automatically.
             st.success("✅ All bills cleared!")
             st.rerun()
     else:
@@ -419,8 +781,13 @@ def main():
     # Bill upload interface
     st.write("**Upload Additional Bills:**")
     uploaded_file = st.file_uploader("Upload JSON bill", type="json", key="bill_uploader")
-    if uploaded_file:
-        bill_data = json.load(uploaded_file)
+    # The uploader keeps its file across reruns, so without a guard the
+    # same upload is re-parsed and re-checked on every interaction. Skip
+    # everything once this exact payload has been handled.
+    if uploaded_file and st.session_state.get("processed_upload_hash") != (
+        upload_hash := hashlib.blake2b(uploaded_file.getvalue(), digest_size=8).hexdigest()
+    ):
+        bill_data = orjson.loads(uploaded_file.getvalue())
         parsed_bill = parseBill(bill_data)
         existing_data = load_user_data(st.session_state.user_id)
         if "bills" not in existing_data:
@@ -429,8 +796,12 @@ def main():
         # Debug: Show what we're uploading
         st.write(f"🔍 **Uploading:** Bill #{parsed_bill.get('billNo')} dated {parsed_bill.get('billDate')}")
         
-        # Check for duplicate bills
-        if check_duplicate_bill(existing_data["bills"], parsed_bill):
+        # Check for duplicate bills against the persisted index; fall back
+        # to deriving it for files saved before the index existed.
+        bill_index = set(map(tuple, existing_data.get("_billKey", [])))
+        if not bill_index and existing_data["bills"]:
+            bill_index = {(b.get("billNo"), b.get("billDate")) for b in existing_data["bills"]}
+        if check_duplicate_bill(bill_index, parsed_bill):
             st.error(f"❌ Duplicate bill detected! Bill #{parsed_bill['billNo']} dated {parsed_bill['billDate']} already exists.")
             
             # Offer to replace existing bills
@@ -443,21 +814,18 @@ def main():
                                                    bill.get("billDate") == parsed_bill.get("billDate"))]
                     existing_data["bills"].append(parsed_bill)
                     save_user_data(st.session_state.user_id, existing_data)
-                    # Reset context when bills change
-                    if "context_prompt_added" in st.session_state:
-                        del st.session_state["context_prompt_added"]
+                    st.session_state["processed_upload_hash"] = upload_hash
                     st.success("✅ Bill replaced successfully!")
                     st.rerun()
             with col2:
                 if st.button("❌ Cancel Upload"):
+                    st.session_state["processed_upload_hash"] = upload_hash
                     st.info("Upload cancelled.")
                     st.rerun()
         else:
             existing_data["bills"].append(parsed_bill)
             save_user_data(st.session_state.user_id, existing_data)
-            # Reset context when new bills are added
-            if "context_prompt_added" in st.session_state:
-                del st.session_state["context_prompt_added"]
+            st.session_state["processed_upload_hash"] = upload_hash
             st.success("✅ Bill uploaded successfully!")
             st.info(f"📊 You now have {len(existing_data['bills'])} bill(s) ready for analysis.")
             st.rerun()
@@ -470,19 +838,17 @@ def main():
     # Initialize conversation in the session state
     # "context_prompt_added" indicates whether we've added the specialized "bill info" context yet.
     if "messages" not in st.session_state:
-        st.session_state["messages"] = [
-            {"role": "system", "content": "You are a helpful telecom billing assistant. Always respond in English, even when the billing data contains Romanian text. Explain telecom charges, compare bills, and help users understand their billing information."},
-            {"role": "assistant", "content": "How can I help you with your telecom bill?"}
-        ]
+        st.session_state["messages"] = list(_INITIAL_MESSAGES)
     if "context_prompt_added" not in st.session_state:
         st.session_state.context_prompt_added = False
 
     st.markdown("---")
     st.subheader("💬 Chat")
 
-    # Display conversation
-    for msg in st.session_state["messages"]:
-        if msg["role"] != "system":  # Don't show system messages
+    # Display conversation — render only the recent window so rerun work
+    # stays bounded as the history grows (every rerun redraws the chat).
+    for msg in st.session_state["messages"][-20:]:
+        if msg["role"] in ("user", "assistant") and not msg.get("tool_calls"):
             st.chat_message(msg["role"]).write(msg["content"])
 
     # Chat input
@@ -491,248 +857,48 @@ def main():
             st.error("❌ You must enter a valid phone number.")
             return
 
-        # If the context prompt hasn't been added yet, build & inject it once;
-        # otherwise, just add the user's raw question.
-        if not st.session_state.context_prompt_added:
-            final_prompt = process_query(prompt, st.session_state["user_id"], model_name)
-            if final_prompt is None:
-                st.stop()
-            st.session_state["messages"].append({"role": "user", "content": final_prompt})
-            st.session_state.context_prompt_added = True
-        else:
-            st.session_state["messages"].append({"role": "user", "content": prompt})
+        # Build/refresh the bill-context system message at index 1; user
+        # turns always carry the raw question.
+        _ensure_bill_context(prompt, st.session_state["user_id"], model_name)
+        st.session_state["messages"].append({"role": "user", "content": prompt})
 
         # Display the latest user message in the chat
         st.chat_message("user").write(prompt)
 
-        # Call OpenAI API
-        with st.spinner("🤖 Thinking..."):
-            try:
-                completion = client.chat.completions.create(
-                    model=model_name,
-                    messages=st.session_state["messages"]
-                )
-                response_text = completion.choices[0].message.content.strip()
-
-                st.session_state["messages"].append({"role": "assistant", "content": response_text})
-                st.chat_message("assistant").write(response_text)
-
-                # Show model and token usage in sidebar
-                if hasattr(completion, "usage"):
-                    st.sidebar.markdown("---")
-                    st.sidebar.subheader("🤖 Current Model")
-                    st.sidebar.write(f"**Model:** {model_name}")
-                    st.sidebar.subheader("🔢 Token Usage")
-                    st.sidebar.write(f"Prompt: {completion.usage.prompt_tokens}")
-                    st.sidebar.write(f"Completion: {completion.usage.completion_tokens}")
-                    st.sidebar.write(f"Total: {completion.usage.total_tokens}")
-
-            except Exception as e:
-                st.error(f"❌ Error calling OpenAI API: {str(e)}")
+        # Call OpenAI API, streaming tokens into the chat as they arrive
+        try:
+            usage_box = {}
+            response_text = st.chat_message("assistant").write_stream(
+                _stream_turn(model_name, st.session_state["messages"],
+                             st.session_state["user_id"], usage_box)
+            )
+            st.session_state["messages"].append({"role": "assistant", "content": response_text})
+
+            # Show model and token usage in sidebar
+            usage = usage_box.get("usage")
+            if usage:
+                st.sidebar.markdown("---")
+                st.sidebar.subheader("🤖 Current Model")
+                st.sidebar.write(f"**Model:** {model_name}")
+                st.sidebar.subheader("🔢 Token Usage")
+                st.sidebar.write(f"Prompt: {usage.prompt_tokens}")
+                st.sidebar.write(f"Completion: {usage.completion_tokens}")
+                st.sidebar.write(f"Total: {usage.total_tokens}")
+
+        except Exception as e:
+            st.error(f"❌ Error calling OpenAI API: {str(e)}")
 
     # Quick action buttons for common queries
     st.markdown("---")
     st.subheader("🚀 Quick Actions")
     st.info("💡 Click these buttons to automatically ask common questions about your bills:")
-    
-    col1, col2, col3 = st.columns(3)
-    
-    with col1:
-        if st.button("💰 Show Total Amount", use_container_width=True):
-            # Process the question through LLM
-            question = "What is the total amount due on my latest bill?"
-            if not st.session_state.context_prompt_added:
-                final_prompt = process_query(question, st.session_state["user_id"], model_name)
-                if final_prompt:
-                    st.session_state["messages"].append({"role": "user", "content": final_prompt})
-                    st.session_state.context_prompt_added = True
-            else:
-                st.session_state["messages"].append({"role": "user", "content": question})
-            
-            # Get AI response
-            try:
-                completion = client.chat.completions.create(
-                    model=model_name,
-                    messages=st.session_state["messages"]
-                )
-                response_text = completion.choices[0].message.content.strip()
-                st.session_state["messages"].append({"role": "assistant", "content": response_text})
-                
-                # Show model and token usage in sidebar
-                if hasattr(completion, "usage"):
-                    st.sidebar.markdown("---")
-                    st.sidebar.subheader("🤖 Current Model")
-                    st.sidebar.write(f"**Model:** {model_name}")
-                    st.sidebar.subheader("🔢 Token Usage")
-                    st.sidebar.write(f"Prompt: {completion.usage.prompt_tokens}")
-                    st.sidebar.write(f"Completion: {completion.usage.completion_tokens}")
-                    st.sidebar.write(f"Total: {completion.usage.total_tokens}")
-                
-            except Exception as e:
-                st.error(f"Error: {str(e)}")
-    
-    with col2:
-        if st.button("📊 Compare Bills", use_container_width=True):
-            question = "Compare my bills and show me the differences between them."
-            if not st.session_state.context_prompt_added:
-                final_prompt = process_query(question, st.session_state["user_id"], model_name)
-                if final_prompt:
-                    st.session_state["messages"].append({"role": "user", "content": final_prompt})
-                    st.session_state.context_prompt_added = True
-            else:
-                st.session_state["messages"].append({"role": "user", "content": question})
-            
-            try:
-                completion = client.chat.completions.create(
-                    model=model_name,
-                    messages=st.session_state["messages"]
-                )
-                response_text = completion.choices[0].message.content.strip()
-                st.session_state["messages"].append({"role": "assistant", "content": response_text})
-                
-                # Show model and token usage in sidebar
-                if hasattr(completion, "usage"):
-                    st.sidebar.markdown("---")
-                    st.sidebar.subheader("🤖 Current Model")
-                    st.sidebar.write(f"**Model:** {model_name}")
-                    st.sidebar.subheader("🔢 Token Usage")
-                    st.sidebar.write(f"Prompt: {completion.usage.prompt_tokens}")
-                    st.sidebar.write(f"Completion: {completion.usage.completion_tokens}")
-                    st.sidebar.write(f"Total: {completion.usage.total_tokens}")
-                
-            except Exception as e:
-                st.error(f"Error: {str(e)}")
-    
-    with col3:
-        if st.button("🔍 Cost Breakdown", use_container_width=True):
-            question = "Give me a detailed breakdown of all charges on my bill."
-            if not st.session_state.context_prompt_added:
-                final_prompt = process_query(question, st.session_state["user_id"], model_name)
-                if final_prompt:
-                    st.session_state["messages"].append({"role": "user", "content": final_prompt})
-                    st.session_state.context_prompt_added = True
-            else:
-                st.session_state["messages"].append({"role": "user", "content": question})
-            
-            try:
-                completion = client.chat.completions.create(
-                    model=model_name,
-                    messages=st.session_state["messages"]
-                )
-                response_text = completion.choices[0].message.content.strip()
-                st.session_state["messages"].append({"role": "assistant", "content": response_text})
-                
-                # Show model and token usage in sidebar
-                if hasattr(completion, "usage"):
-                    st.sidebar.markdown("---")
-                    st.sidebar.subheader("🤖 Current Model")
-                    st.sidebar.write(f"**Model:** {model_name}")
-                    st.sidebar.subheader("🔢 Token Usage")
-                    st.sidebar.write(f"Prompt: {completion.usage.prompt_tokens}")
-                    st.sidebar.write(f"Completion: {completion.usage.completion_tokens}")
-                    st.sidebar.write(f"Total: {completion.usage.total_tokens}")
-                
-            except Exception as e:
-                st.error(f"Error: {str(e)}")
-    
-    # Additional quick actions
-    col4, col5, col6 = st.columns(3)
-    
-    with col4:
-        if st.button("📱 Device Charges", use_container_width=True):
-            question = "Show me all device-related charges and installments on my bills."
-            if not st.session_state.context_prompt_added:
-                final_prompt = process_query(question, st.session_state["user_id"], model_name)
-                if final_prompt:
-                    st.session_state["messages"].append({"role": "user", "content": final_prompt})
-                    st.session_state.context_prompt_added = True
-            else:
-                st.session_state["messages"].append({"role": "user", "content": question})
-            
-            try:
-                completion = client.chat.completions.create(
-                    model=model_name,
-                    messages=st.session_state["messages"]
-                )
-                response_text = completion.choices[0].message.content.strip()
-                st.session_state["messages"].append({"role": "assistant", "content": response_text})
-                
-                # Show model and token usage in sidebar
-                if hasattr(completion, "usage"):
-                    st.sidebar.markdown("---")
-                    st.sidebar.subheader("🤖 Current Model")
-                    st.sidebar.write(f"**Model:** {model_name}")
-                    st.sidebar.subheader("🔢 Token Usage")
-                    st.sidebar.write(f"Prompt: {completion.usage.prompt_tokens}")
-                    st.sidebar.write(f"Completion: {completion.usage.completion_tokens}")
-                    st.sidebar.write(f"Total: {completion.usage.total_tokens}")
-                
-            except Exception as e:
-                st.error(f"Error: {str(e)}")
-    
-    with col5:
-        if st.button("🎯 Discounts & Promotions", use_container_width=True):
-            question = "What discounts and promotions are applied to my bills?"
-            if not st.session_state.context_prompt_added:
-                final_prompt = process_query(question, st.session_state["user_id"], model_name)
-                if final_prompt:
-                    st.session_state["messages"].append({"role": "user", "content": final_prompt})
-                    st.session_state.context_prompt_added = True
-            else:
-                st.session_state["messages"].append({"role": "user", "content": question})
-            
-            try:
-                completion = client.chat.completions.create(
-                    model=model_name,
-                    messages=st.session_state["messages"]
-                )
-                response_text = completion.choices[0].message.content.strip()
-                st.session_state["messages"].append({"role": "assistant", "content": response_text})
-                
-                # Show model and token usage in sidebar
-                if hasattr(completion, "usage"):
-                    st.sidebar.markdown("---")
-                    st.sidebar.subheader("🤖 Current Model")
-                    st.sidebar.write(f"**Model:** {model_name}")
-                    st.sidebar.subheader("🔢 Token Usage")
-                    st.sidebar.write(f"Prompt: {completion.usage.prompt_tokens}")
-                    st.sidebar.write(f"Completion: {completion.usage.completion_tokens}")
-                    st.sidebar.write(f"Total: {completion.usage.total_tokens}")
-                
-            except Exception as e:
-                st.error(f"Error: {str(e)}")
-    
-    with col6:
-        if st.button("📈 Usage Analysis", use_container_width=True):
-            question = "Analyze my service usage and explain what I'm paying for."
-            if not st.session_state.context_prompt_added:
-                final_prompt = process_query(question, st.session_state["user_id"], model_name)
-                if final_prompt:
-                    st.session_state["messages"].append({"role": "user", "content": final_prompt})
-                    st.session_state.context_prompt_added = True
-            else:
-                st.session_state["messages"].append({"role": "user", "content": question})
-            
-            try:
-                completion = client.chat.completions.create(
-                    model=model_name,
-                    messages=st.session_state["messages"]
-                )
-                response_text = completion.choices[0].message.content.strip()
-                st.session_state["messages"].append({"role": "assistant", "content": response_text})
-                
-                # Show model and token usage in sidebar
-                if hasattr(completion, "usage"):
-                    st.sidebar.markdown("---")
-                    st.sidebar.subheader("🤖 Current Model")
-                    st.sidebar.write(f"**Model:** {model_name}")
-                    st.sidebar.subheader("🔢 Token Usage")
-                    st.sidebar.write(f"Prompt: {completion.usage.prompt_tokens}")
-                    st.sidebar.write(f"Completion: {completion.usage.completion_tokens}")
-                    st.sidebar.write(f"Total: {completion.usage.total_tokens}")
-                
-            except Exception as e:
-                st.error(f"Error: {str(e)}")
+
+    for row_start in range(0, len(QUICK_ACTIONS), 3):
+        row_actions = QUICK_ACTIONS[row_start:row_start + 3]
+        for col, (label, question) in zip(st.columns(3), row_actions):
+            with col:
+                if st.button(label, use_container_width=True):
+                    process_quick_action(question, st.session_state["user_id"], model_name)
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -7,15 +7,23 @@ This script formats multiple sheets based on a template sheet's formatting.
 Perfect for applying consistent formatting across multiple sheets.
 """
 
+import functools
 import json
 import os
+import tempfile
 from datetime import datetime
 
+@functools.lru_cache(maxsize=1)
+def _load_config_cached(mtime_ns):
+    with open('sheets_config.json', 'r') as f:
+        return json.load(f)
+
 def load_config():
     """Load configuration from sheets_config.json"""
     try:
-        with open('sheets_config.json', 'r') as f:
-            return json.load(f)
+        # Keyed on mtime so repeat calls in one run reuse the parsed dict
+        # while an edited config still invalidates the cache.
+        return _load_config_cached(os.stat('sheets_config.json').st_mtime_ns)
     except FileNotFoundError:
         print("❌ Configuration file 'sheets_config.json' not found!")
         return None
@@ -36,23 +44,23 @@ def copy_column_structure(automator, spreadsheet, template_sheet_name, target_sh
     print(f"\n📋 Copying column structure from '{template_sheet_name}'...")
     
     try:
-        template_sheet = spreadsheet.worksheet(template_sheet_name)
-        template_headers = template_sheet.row_values(1)  # Get first row (headers)
-        
+        template_sheet = automator.worksheet(spreadsheet, template_sheet_name)
+        template_headers = automator.call_with_retry(template_sheet.row_values, 1)  # Get first row (headers)
+
         print(f"📝 Template headers: {template_headers}")
-        
-        for target_sheet_name in target_sheets:
-            try:
-                target_sheet = spreadsheet.worksheet(target_sheet_name)
-                
-                # Update headers
-                if template_headers:
-                    target_sheet.update('A1', [template_headers])
-                    print(f"✅ Updated headers in '{target_sheet_name}'")
-                
-            except Exception as e:
-                print(f"⚠️ Could not update '{target_sheet_name}': {e}")
-                
+
+        if template_headers and target_sheets:
+            # One values.batchUpdate writes every sheet's header row in a
+            # single round trip instead of one update per sheet
+            automator.call_with_retry(spreadsheet.values_batch_update, {
+                "valueInputOption": "RAW",
+                "data": [
+                    {"range": f"'{name}'!A1", "values": [template_headers]}
+                    for name in target_sheets
+                ],
+            })
+            print(f"✅ Updated headers in {len(target_sheets)} sheets")
+
     except Exception as e:
         print(f"❌ Error copying structure: {e}")
 
@@ -64,32 +72,40 @@ def apply_formatting_to_sheets(automator, spreadsheet, target_sheets, formatting
     data_format = formatting_config.get('data_format', {})
     alternate_format = formatting_config.get('alternate_row_format', {})
     
+    # Every sheet's ranges accumulate here and go out in ONE batchUpdate
+    # for the whole run, so the request count stays flat as sheets grow.
+    requests = []
+
     for sheet_name in target_sheets:
         try:
-            print(f"🎨 Formatting sheet: '{sheet_name}'")
-            
+            print(f"🎨 Queueing formatting for sheet: '{sheet_name}'")
+
+            worksheet = automator.worksheet(spreadsheet, sheet_name)
+            sheet_id = worksheet.id
+            # Bound ranges by the sheet's real size instead of a blanket
+            # row 1000, so the server doesn't format thousands of empty
+            # cells per sheet.
+            last_row = worksheet.row_count
+
             # Format header row (row 1)
             if header_format:
-                automator.format_cells(spreadsheet, sheet_name, "1:1", header_format)
-            
+                requests.append(automator.build_format_request(sheet_id, "1:1", header_format))
+
             # Format data rows (starting from row 2)
             if data_format:
-                automator.format_cells(spreadsheet, sheet_name, "2:1000", data_format)
-            
+                requests.append(automator.build_format_request(sheet_id, f"2:{last_row}", data_format))
+
             # Apply alternate row formatting if specified
             if alternate_format:
-                # Format every other row (3, 5, 7, etc.)
-                for row in range(3, 1000, 2):
-                    range_str = f"{row}:{row}"
-                    try:
-                        automator.format_cells(spreadsheet, sheet_name, range_str, alternate_format)
-                    except:
-                        break  # Stop if we hit empty rows
-            
-            print(f"✅ Applied formatting to '{sheet_name}'")
-            
+                # Every other row (3, 5, 7, ...) rides in the same batch
+                # call instead of one HTTP round trip per row.
+                for row in range(3, last_row + 1, 2):
+                    requests.append(automator.build_format_request(sheet_id, f"{row}:{row}", alternate_format))
+
         except Exception as e:
-            print(f"⚠️ Could not format '{sheet_name}': {e}")
+            print(f"⚠️ Could not queue formatting for '{sheet_name}': {e}")
+
+    automator.batch_format(spreadsheet, requests)
 
 def copy_template_formatting(automator, spreadsheet, template_sheet_name, target_sheets):
     """Copy exact formatting from template sheet to target sheets"""
@@ -97,50 +113,62 @@ def copy_template_formatting(automator, spreadsheet, template_sheet_name, target
     
     try:
         # Get template sheet data and formatting
-        template_sheet = spreadsheet.worksheet(template_sheet_name)
+        template_sheet = automator.worksheet(spreadsheet, template_sheet_name)
         
         # Get all values from template
-        template_values = template_sheet.get_all_values()
+        template_values = automator.call_with_retry(template_sheet.get_all_values)
         
         if not template_values:
             print("⚠️ Template sheet is empty")
             return
         
         print(f"📊 Template has {len(template_values)} rows")
-        
+
+        headers = template_values[0]  # First row
+
+        # Basic formatting that matches the template; the dicts are the
+        # same for every target sheet
+        header_format = {
+            'backgroundColor': {'red': 0.2, 'green': 0.6, 'blue': 0.9},
+            'textFormat': {'bold': True, 'foregroundColor': {'red': 1, 'green': 1, 'blue': 1}},
+            'horizontalAlignment': 'CENTER'
+        }
+        data_format = {
+            'backgroundColor': {'red': 0.98, 'green': 0.98, 'blue': 0.98},
+            'textFormat': {'fontSize': 10}
+        }
+
+        import gspread
+
+        # rowcol_to_a1 stays correct past column Z, where chr(64 + n)
+        # silently produced garbage ranges
+        header_range = f"A1:{gspread.utils.rowcol_to_a1(1, len(headers))}" if headers else "A1:Z1"
+
+        # All sheets' formatting goes out in one batchUpdate at the end
+        requests = []
+
         for target_sheet_name in target_sheets:
             try:
-                target_sheet = spreadsheet.worksheet(target_sheet_name)
-                
+                target_sheet = automator.worksheet(spreadsheet, target_sheet_name)
+
                 # Copy structure (headers) only
-                if template_values:
-                    headers = template_values[0]  # First row
-                    target_sheet.update('A1', [headers])
-                
-                # Apply basic formatting that matches template
-                # Header formatting
-                header_format = {
-                    'backgroundColor': {'red': 0.2, 'green': 0.6, 'blue': 0.9},
-                    'textFormat': {'bold': True, 'foregroundColor': {'red': 1, 'green': 1, 'blue': 1}},
-                    'horizontalAlignment': 'CENTER'
-                }
-                
-                # Data formatting
-                data_format = {
-                    'backgroundColor': {'red': 0.98, 'green': 0.98, 'blue': 0.98},
-                    'textFormat': {'fontSize': 10}
-                }
-                
-                # Apply formatting
-                header_range = f"A1:{chr(64 + len(headers))}1" if headers else "A1:Z1"
-                automator.format_cells(spreadsheet, target_sheet_name, header_range, header_format)
-                automator.format_cells(spreadsheet, target_sheet_name, "A2:Z1000", data_format)
-                
-                print(f"✅ Copied template formatting to '{target_sheet_name}'")
-                
+                if headers:
+                    automator.call_with_retry(target_sheet.update, 'A1', [headers])
+
+                # Bound the data range by the target's real dimensions
+                # instead of a blanket A2:Z1000
+                data_range = f"A2:{gspread.utils.rowcol_to_a1(target_sheet.row_count, max(len(headers), 1))}"
+
+                requests.append(automator.build_format_request(target_sheet.id, header_range, header_format))
+                requests.append(automator.build_format_request(target_sheet.id, data_range, data_format))
+
+                print(f"✅ Queued template formatting for '{target_sheet_name}'")
+
             except Exception as e:
                 print(f"⚠️ Could not format '{target_sheet_name}': {e}")
-                
+
+        automator.batch_format(spreadsheet, requests)
+
     except Exception as e:
         print(f"❌ Error copying template formatting: {e}")
 
@@ -183,7 +211,7 @@ def main():
         return
     
     # Import after dependency check
-    from google_sheets_automation import GoogleSheetsAutomator
+    from google_sheets_automation import get_automator
     
     # Initialize
     credentials_file = config['credentials_file']
@@ -201,15 +229,24 @@ def main():
             print("❌ No spreadsheet ID provided.")
             return
         
-        # Update config file
-        config['spreadsheet_id'] = spreadsheet_id
-        with open('sheets_config.json', 'w') as f:
-            json.dump(config, f, indent=2)
-        print("✅ Saved spreadsheet ID to config")
+        # Update config file — only when the id actually changed, and
+        # through a temp file + rename so a concurrent run never sees a
+        # half-written config
+        if config.get('spreadsheet_id') != spreadsheet_id:
+            config['spreadsheet_id'] = spreadsheet_id
+            fd, tmp_path = tempfile.mkstemp(dir='.', suffix='.json')
+            try:
+                with os.fdopen(fd, 'w') as f:
+                    json.dump(config, f, indent=2)
+                os.replace(tmp_path, 'sheets_config.json')
+            except OSError:
+                os.unlink(tmp_path)
+                raise
+            print("✅ Saved spreadsheet ID to config")
     
     try:
         # Connect to Google Sheets
-        automator = GoogleSheetsAutomator(credentials_file)
+        automator = get_automator(credentials_file)
         spreadsheet = automator.open_spreadsheet(spreadsheet_id)
         
         if not spreadsheet:
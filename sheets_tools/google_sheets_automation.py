@@ -16,14 +16,25 @@ Requirements:
 - gspread library for easy Google Sheets access
 """
 
+import functools
 import gspread
 from google.oauth2.service_account import Credentials
 import pandas as pd
 import json
+import random
 from typing import List, Dict, Any, Optional
 import time
 from datetime import datetime
 
+def _cell_value(value) -> Dict[str, Any]:
+    """ExtendedValue wrapper for one cell in an updateCells request."""
+    if isinstance(value, bool):
+        return {"userEnteredValue": {"boolValue": value}}
+    if isinstance(value, (int, float)):
+        return {"userEnteredValue": {"numberValue": value}}
+    return {"userEnteredValue": {"stringValue": str(value)}}
+
+
 class GoogleSheetsAutomator:
     """Automate operations across multiple Google Sheets."""
     
@@ -44,10 +55,58 @@ class GoogleSheetsAutomator:
                 credentials_file, scopes=self.scope
             )
             self.client = gspread.authorize(self.creds)
+            # Worksheet objects keyed by (spreadsheet id, sheet title);
+            # populated in bulk so per-sheet operations stop re-fetching
+            # metadata over HTTP.
+            self._ws_cache = {}
             print("✅ Successfully connected to Google Sheets API")
         except Exception as e:
             print(f"❌ Failed to initialize Google Sheets client: {e}")
             raise
+
+    # Transient statuses worth retrying; anything else fails fast.
+    _RETRYABLE_STATUS = (429, 500, 502, 503)
+
+    def call_with_retry(self, request, *args, **kwargs):
+        """
+        Issue one API call, retrying transient failures.
+
+        Rate limits and server errors (429/5xx) back off exponentially
+        with jitter up to five retries, so a single 503 no longer aborts
+        a whole batch run; other errors surface to the caller's own
+        handling immediately.
+        """
+        for attempt in range(5):
+            try:
+                return request(*args, **kwargs)
+            except gspread.exceptions.APIError as e:
+                status = getattr(getattr(e, "response", None), "status_code", None)
+                if status not in self._RETRYABLE_STATUS:
+                    raise
+                wait = min(60.0, 2 ** attempt + random.random())
+                print(f"⏳ API returned {status}; retrying in {wait:.1f}s...")
+                time.sleep(wait)
+        return request(*args, **kwargs)
+
+    def worksheet(self, spreadsheet, sheet_name: str):
+        """
+        Resolve a worksheet through the metadata cache.
+
+        A single spreadsheet.worksheets() call caches every sheet's
+        object (including its sheetId), replacing one metadata round
+        trip per sheet lookup.
+        """
+        key = (spreadsheet.id, sheet_name)
+        if key not in self._ws_cache:
+            for ws in spreadsheet.worksheets():
+                self._ws_cache[(spreadsheet.id, ws.title)] = ws
+        return self._ws_cache[key]
+
+    def _invalidate_ws_cache(self, spreadsheet):
+        """Drop cached worksheets after the sheet list changes."""
+        spreadsheet_id = spreadsheet.id
+        for key in [k for k in self._ws_cache if k[0] == spreadsheet_id]:
+            del self._ws_cache[key]
     
     def open_spreadsheet(self, spreadsheet_id: str):
         """
@@ -70,7 +129,19 @@ class GoogleSheetsAutomator:
     def list_all_sheets(self, spreadsheet) -> List[str]:
         """Get list of all sheet names in the spreadsheet."""
         try:
-            sheet_names = [sheet.title for sheet in spreadsheet.worksheets()]
+            # A warm worksheet cache already holds every sheet for this
+            # spreadsheet (create/delete invalidate it), so repeat
+            # listings cost no API call.
+            cached = [title for sid, title in self._ws_cache if sid == spreadsheet.id]
+            if cached:
+                return cached
+            worksheets = spreadsheet.worksheets()
+            # The same fetch warms the worksheet cache, so the per-sheet
+            # operations that follow a listing (auto-detect → format)
+            # resolve their sheets without another metadata round trip.
+            for ws in worksheets:
+                self._ws_cache[(spreadsheet.id, ws.title)] = ws
+            sheet_names = [ws.title for ws in worksheets]
             print(f"📋 Found {len(sheet_names)} sheets: {sheet_names}")
             return sheet_names
         except Exception as e:
@@ -89,8 +160,8 @@ class GoogleSheetsAutomator:
             pandas.DataFrame with the sheet data
         """
         try:
-            worksheet = spreadsheet.worksheet(sheet_name)
-            data = worksheet.get_all_records()
+            worksheet = self.worksheet(spreadsheet, sheet_name)
+            data = self.call_with_retry(worksheet.get_all_records)
             df = pd.DataFrame(data)
             print(f"✅ Read {len(df)} rows from sheet '{sheet_name}'")
             return df
@@ -98,7 +169,54 @@ class GoogleSheetsAutomator:
             print(f"❌ Failed to read sheet '{sheet_name}': {e}")
             return pd.DataFrame()
     
-    def write_sheet_data(self, spreadsheet, sheet_name: str, df: pd.DataFrame, 
+    def batch_read_sheets(self, spreadsheet, sheet_names: List[str]) -> Dict[str, pd.DataFrame]:
+        """
+        Read several sheets in a single values.batchGet call.
+
+        Args:
+            spreadsheet: gspread.Spreadsheet object
+            sheet_names: Names of the sheets to read
+
+        Returns:
+            Dict mapping each sheet name to a DataFrame (empty on failure)
+        """
+        try:
+            # UNFORMATTED_VALUE keeps numbers typed like get_all_records
+            # did, instead of display strings that a later RAW write
+            # would turn into text.
+            response = self.call_with_retry(spreadsheet.values_batch_get,
+                                  ranges=[f"'{name}'" for name in sheet_names],
+                                  params={"valueRenderOption": "UNFORMATTED_VALUE"})
+            value_ranges = response.get("valueRanges", [])
+        except Exception as e:
+            print(f"❌ Failed batch read: {e}")
+            return {name: pd.DataFrame() for name in sheet_names}
+
+        data = {}
+        for name, value_range in zip(sheet_names, value_ranges):
+            rows = value_range.get("values", [])
+            # One malformed sheet degrades to an empty frame, as the
+            # per-sheet read_sheet_data did, instead of killing the run.
+            try:
+                if rows:
+                    # The API drops trailing empty cells; pad rows back
+                    # to the header width with '' so they read the way
+                    # get_all_records returned them, not as NaN.
+                    width = len(rows[0])
+                    df = pd.DataFrame(
+                        [row + [''] * (width - len(row)) for row in rows[1:]],
+                        columns=rows[0],
+                    )
+                else:
+                    df = pd.DataFrame()
+                print(f"✅ Read {len(df)} rows from sheet '{name}'")
+            except Exception as e:
+                print(f"❌ Failed to read sheet '{name}': {e}")
+                df = pd.DataFrame()
+            data[name] = df
+        return data
+
+    def write_sheet_data(self, spreadsheet, sheet_name: str, df: pd.DataFrame,
                         start_cell: str = 'A1', include_headers: bool = True):
         """
         Write DataFrame data to a specific sheet.
@@ -111,21 +229,39 @@ class GoogleSheetsAutomator:
             include_headers: Whether to include column headers
         """
         try:
-            worksheet = spreadsheet.worksheet(sheet_name)
-            
-            # Clear existing data
-            worksheet.clear()
-            
+            worksheet = self.worksheet(spreadsheet, sheet_name)
+
             # Prepare data
             if include_headers:
                 data = [df.columns.tolist()] + df.values.tolist()
             else:
                 data = df.values.tolist()
-            
-            # Write data
-            worksheet.update(start_cell, data)
+
+            start_row, start_col = gspread.utils.a1_to_rowcol(start_cell)
+
+            # One updateCells request both writes the new values and
+            # blanks whatever a previous, larger write left behind: cells
+            # in the (open-ended) range that the supplied rows don't
+            # cover get their values cleared. That folds the old
+            # clear() + update pair into a single round trip.
+            self.call_with_retry(spreadsheet.batch_update, {
+                "requests": [{
+                    "updateCells": {
+                        "range": {
+                            "sheetId": worksheet.id,
+                            "startRowIndex": start_row - 1,
+                            "startColumnIndex": start_col - 1,
+                        },
+                        "rows": [
+                            {"values": [_cell_value(v) for v in row]}
+                            for row in data
+                        ],
+                        "fields": "userEnteredValue",
+                    }
+                }]
+            })
             print(f"✅ Written {len(df)} rows to sheet '{sheet_name}'")
-            
+
         except Exception as e:
             print(f"❌ Failed to write to sheet '{sheet_name}': {e}")
     
@@ -138,26 +274,30 @@ class GoogleSheetsAutomator:
             updates: List of update dictionaries with format:
                     [{"sheet": "Sheet1", "range": "A1:B2", "values": [[1,2],[3,4]]}]
         """
+        if not updates:
+            return
         try:
-            for update in updates:
-                sheet_name = update["sheet"]
-                cell_range = update["range"]
-                values = update["values"]
-                
-                worksheet = spreadsheet.worksheet(sheet_name)
-                worksheet.update(cell_range, values)
-                print(f"✅ Updated {cell_range} in sheet '{sheet_name}'")
-                
-                # Small delay to avoid rate limiting
-                time.sleep(0.1)
-                
+            # Every range rides in one values.batchUpdate call — no
+            # per-update round trip, and no sleep-based throttling: the
+            # single request stays far inside the API quota, and _call
+            # backs off if the server does push back.
+            self.call_with_retry(spreadsheet.values_batch_update, {
+                "valueInputOption": "RAW",
+                "data": [
+                    {"range": f"'{update['sheet']}'!{update['range']}", "values": update["values"]}
+                    for update in updates
+                ],
+            })
+            print(f"✅ Updated {len(updates)} range(s) in one batch")
+
         except Exception as e:
             print(f"❌ Failed batch update: {e}")
     
     def create_new_sheet(self, spreadsheet, sheet_name: str, rows: int = 1000, cols: int = 26):
         """Create a new sheet in the spreadsheet."""
         try:
-            worksheet = spreadsheet.add_worksheet(title=sheet_name, rows=rows, cols=cols)
+            worksheet = self.call_with_retry(spreadsheet.add_worksheet, title=sheet_name, rows=rows, cols=cols)
+            self._invalidate_ws_cache(spreadsheet)
             print(f"✅ Created new sheet: '{sheet_name}'")
             return worksheet
         except Exception as e:
@@ -167,13 +307,51 @@ class GoogleSheetsAutomator:
     def delete_sheet(self, spreadsheet, sheet_name: str):
         """Delete a sheet from the spreadsheet."""
         try:
-            worksheet = spreadsheet.worksheet(sheet_name)
-            spreadsheet.del_worksheet(worksheet)
+            worksheet = self.worksheet(spreadsheet, sheet_name)
+            self.call_with_retry(spreadsheet.del_worksheet, worksheet)
+            self._invalidate_ws_cache(spreadsheet)
             print(f"✅ Deleted sheet: '{sheet_name}'")
         except Exception as e:
             print(f"❌ Failed to delete sheet '{sheet_name}': {e}")
     
-    def format_cells(self, spreadsheet, sheet_name: str, cell_range: str, 
+    @staticmethod
+    def build_format_request(sheet_id: int, cell_range: str, format_dict: Dict[str, Any]) -> Dict:
+        """
+        Build one repeatCell request for a later batch_format call.
+
+        Args:
+            sheet_id: Numeric sheetId of the target worksheet
+            cell_range: Range to format in A1 notation (e.g., 'A1:B10', '3:3')
+            format_dict: Formatting options (e.g., {'backgroundColor': {'red': 1}})
+
+        Returns:
+            Request dict ready to go into a spreadsheets.batchUpdate body
+        """
+        return {
+            "repeatCell": {
+                "range": gspread.utils.a1_range_to_grid_range(cell_range, sheet_id),
+                "cell": {"userEnteredFormat": format_dict},
+                "fields": "userEnteredFormat(" + ",".join(format_dict) + ")",
+            }
+        }
+
+    def batch_format(self, spreadsheet, requests: List[Dict]):
+        """
+        Apply accumulated formatting requests in a single batchUpdate call.
+
+        Args:
+            spreadsheet: gspread.Spreadsheet object
+            requests: List of request dicts from build_format_request
+        """
+        if not requests:
+            return
+        try:
+            self.call_with_retry(spreadsheet.batch_update, {"requests": requests})
+            print(f"✅ Applied {len(requests)} formatting request(s) in one batch")
+        except Exception as e:
+            print(f"❌ Failed batch formatting: {e}")
+
+    def format_cells(self, spreadsheet, sheet_name: str, cell_range: str,
                     format_dict: Dict[str, Any]):
         """
         Apply formatting to a range of cells.
@@ -185,8 +363,8 @@ class GoogleSheetsAutomator:
             format_dict: Formatting options (e.g., {'backgroundColor': {'red': 1}})
         """
         try:
-            worksheet = spreadsheet.worksheet(sheet_name)
-            worksheet.format(cell_range, format_dict)
+            worksheet = self.worksheet(spreadsheet, sheet_name)
+            self.call_with_retry(worksheet.format, cell_range, format_dict)
             print(f"✅ Applied formatting to {cell_range} in '{sheet_name}'")
         except Exception as e:
             print(f"❌ Failed to format cells: {e}")
@@ -194,31 +372,51 @@ class GoogleSheetsAutomator:
     def add_formula(self, spreadsheet, sheet_name: str, cell: str, formula: str):
         """Add a formula to a specific cell."""
         try:
-            worksheet = spreadsheet.worksheet(sheet_name)
-            worksheet.update(cell, formula)
+            worksheet = self.worksheet(spreadsheet, sheet_name)
+            self.call_with_retry(worksheet.update, cell, formula)
             print(f"✅ Added formula to {cell} in '{sheet_name}': {formula}")
         except Exception as e:
             print(f"❌ Failed to add formula: {e}")
     
     def export_sheets_to_csv(self, spreadsheet, output_dir: str = "./exports"):
         """Export all sheets to separate CSV files."""
+        import csv
         import os
-        
+
         try:
             os.makedirs(output_dir, exist_ok=True)
             sheet_names = self.list_all_sheets(spreadsheet)
-            
-            for sheet_name in sheet_names:
-                df = self.read_sheet_data(spreadsheet, sheet_name)
-                if not df.empty:
+
+            # One values.batchGet covers every sheet, and the returned
+            # 2-D arrays go straight to csv.writer — no per-sheet HTTP
+            # call and no DataFrame construction on the way out.
+            response = self.call_with_retry(spreadsheet.values_batch_get,
+                                  ranges=[f"'{name}'" for name in sheet_names])
+
+            for sheet_name, value_range in zip(sheet_names, response.get("valueRanges", [])):
+                rows = value_range.get("values", [])
+                if rows:
                     csv_path = os.path.join(output_dir, f"{sheet_name}.csv")
-                    df.to_csv(csv_path, index=False)
+                    with open(csv_path, "w", newline="") as f:
+                        csv.writer(f).writerows(rows)
                     print(f"✅ Exported '{sheet_name}' to {csv_path}")
-                    
+
         except Exception as e:
             print(f"❌ Failed to export sheets: {e}")
 
 
+@functools.lru_cache(maxsize=None)
+def get_automator(credentials_file: str) -> GoogleSheetsAutomator:
+    """
+    Shared automator per credentials file.
+
+    Re-running GoogleSheetsAutomator() repeats the credential parse and
+    OAuth token exchange; callers in the same process get one client
+    (with its worksheet cache) instead.
+    """
+    return GoogleSheetsAutomator(credentials_file)
+
+
 def example_usage():
     """Example of how to use the GoogleSheetsAutomator."""
     
@@ -233,20 +431,38 @@ def example_usage():
         # List all sheets
         sheets = automator.list_all_sheets(spreadsheet)
         
-        # Read data from multiple sheets
-        all_data = {}
+        # Example: stamp a last_updated column on every sheet without the
+        # old read-everything / clear / rewrite-everything cycle. One
+        # batchGet fetches each sheet's header row plus column A (for the
+        # data row count); one values.batchUpdate writes the new column.
+        now_str = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        ranges = []
         for sheet_name in sheets:
-            df = automator.read_sheet_data(spreadsheet, sheet_name)
-            all_data[sheet_name] = df
-        
-        # Example: Process data and write back
-        for sheet_name, df in all_data.items():
-            if not df.empty:
-                # Add a timestamp column
-                df['last_updated'] = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-                
-                # Write back to sheet
-                automator.write_sheet_data(spreadsheet, sheet_name, df)
+            ranges.extend([f"'{sheet_name}'!1:1", f"'{sheet_name}'!A:A"])
+        response = automator.call_with_retry(spreadsheet.values_batch_get, ranges=ranges)
+        value_ranges = response.get("valueRanges", [])
+
+        data = []
+        for i, sheet_name in enumerate(sheets):
+            header = value_ranges[2 * i].get("values", [[]])[0]
+            n_rows = len(value_ranges[2 * i + 1].get("values", []))
+            if not header or n_rows < 2:
+                continue
+            # Reuse the column from a previous run; only a sheet that
+            # has never been stamped gets a new one appended.
+            if "last_updated" in header:
+                col_index = header.index("last_updated") + 1
+            else:
+                col_index = len(header) + 1
+            col = gspread.utils.rowcol_to_a1(1, col_index).rstrip("1")
+            data.append({"range": f"'{sheet_name}'!{col}1", "values": [["last_updated"]]})
+            data.append({
+                "range": f"'{sheet_name}'!{col}2:{col}{n_rows}",
+                "values": [[now_str]] * (n_rows - 1),
+            })
+        if data:
+            automator.call_with_retry(spreadsheet.values_batch_update,
+                            {"valueInputOption": "RAW", "data": data})
         
         # Example: Batch updates
         updates = [
@@ -7,15 +7,22 @@ A simplified script for common multi-sheet operations.
 Just update the configuration and run!
 """
 
+import functools
 import json
 import os
 from datetime import datetime
 
+@functools.lru_cache(maxsize=1)
+def _load_config_cached(mtime_ns):
+    with open('sheets_config.json', 'r') as f:
+        return json.load(f)
+
 def load_config():
     """Load configuration from sheets_config.json"""
     try:
-        with open('sheets_config.json', 'r') as f:
-            return json.load(f)
+        # Keyed on mtime so repeat calls in one run reuse the parsed dict
+        # while an edited config still invalidates the cache.
+        return _load_config_cached(os.stat('sheets_config.json').st_mtime_ns)
     except FileNotFoundError:
         print("❌ Configuration file 'sheets_config.json' not found!")
         print("Please copy and edit the sheets_config.json file.")
@@ -46,7 +53,8 @@ def quick_multi_sheet_operations():
         return
     
     # Import after dependency check
-    from google_sheets_automation import GoogleSheetsAutomator
+    from google_sheets_automation import get_automator
+    from gspread.utils import rowcol_to_a1
     import pandas as pd
     
     print("🚀 QUICK GOOGLE SHEETS MULTI-SHEET OPERATIONS")
@@ -67,7 +75,7 @@ def quick_multi_sheet_operations():
     
     try:
         # Connect to Google Sheets
-        automator = GoogleSheetsAutomator(credentials_file)
+        automator = get_automator(credentials_file)
         spreadsheet = automator.open_spreadsheet(spreadsheet_id)
         
         if not spreadsheet:
@@ -83,27 +91,38 @@ def quick_multi_sheet_operations():
         data_sheets = [name for name in all_sheets if name.lower() not in ['summary', 'validation_report']]
         
         print(f"📋 Found {len(data_sheets)} data sheets to process")
-        
+
+        # Fetch all sheet data in one values.batchGet; consolidate and
+        # validate below share this dict so each sheet is read at most
+        # once per run.
+        sheet_data = {}
+        if operations.get('consolidate_data', False) or operations.get('validate_data', False):
+            sheet_data = automator.batch_read_sheets(spreadsheet, data_sheets)
+
         # 1. Consolidate Data
         if operations.get('consolidate_data', False):
             print("\n📊 Consolidating data from multiple sheets...")
             consolidated_data = []
-            
+            today_str = datetime.now().strftime('%Y-%m-%d')
+
             for sheet_name in data_sheets:
-                df = automator.read_sheet_data(spreadsheet, sheet_name)
+                df = sheet_data[sheet_name]
                 if not df.empty:
-                    df['source_sheet'] = sheet_name
-                    df['processed_date'] = datetime.now().strftime('%Y-%m-%d')
-                    consolidated_data.append(df)
-            
+                    # assign leaves the shared sheet_data frames untouched;
+                    # categorical source_sheet stores one code per row
+                    # instead of a repeated string
+                    consolidated_data.append(df.assign(
+                        source_sheet=pd.Categorical([sheet_name] * len(df), categories=data_sheets),
+                        processed_date=today_str,
+                    ))
+
             if consolidated_data:
-                combined_df = pd.concat(consolidated_data, ignore_index=True)
+                combined_df = pd.concat(consolidated_data, ignore_index=True, copy=False)
                 
-                # Create/update summary sheet
-                try:
+                # Create the summary sheet only when the listing says
+                # it is missing; the exists path costs no write request
+                if "Summary" not in all_sheets:
                     automator.create_new_sheet(spreadsheet, "Summary")
-                except:
-                    pass  # Sheet exists
                 
                 automator.write_sheet_data(spreadsheet, "Summary", combined_df)
                 print(f"✅ Consolidated {len(combined_df)} rows into Summary sheet")
@@ -113,73 +132,86 @@ def quick_multi_sheet_operations():
             print("\n🔄 Updating headers across sheets...")
             new_headers = settings.get('new_headers', [])
             
-            for sheet_name in data_sheets:
-                for i, header in enumerate(new_headers):
-                    col_letter = chr(65 + i)  # A, B, C, etc.
-                    cell = f"{col_letter}1"
-                    try:
-                        worksheet = spreadsheet.worksheet(sheet_name)
-                        worksheet.update(cell, header)
-                    except:
-                        pass
-                
-                # Format headers
-                if new_headers:
-                    header_format = {
-                        'backgroundColor': {'red': 0.9, 'green': 0.9, 'blue': 0.9},
-                        'textFormat': {'bold': True}
-                    }
-                    range_to_format = f"A1:{chr(65 + len(new_headers) - 1)}1"
-                    automator.format_cells(spreadsheet, sheet_name, range_to_format, header_format)
-            
+            header_format = {
+                'backgroundColor': {'red': 0.9, 'green': 0.9, 'blue': 0.9},
+                'textFormat': {'bold': True}
+            }
+            if new_headers:
+                # rowcol_to_a1 stays correct past column Z, where
+                # chr-based letter math silently produced garbage ranges
+                range_to_format = f"A1:{rowcol_to_a1(1, len(new_headers))}"
+
+                # One values.batchUpdate writes every sheet's header row,
+                # replacing one update call per cell per sheet
+                try:
+                    automator.call_with_retry(spreadsheet.values_batch_update, {
+                        "valueInputOption": "RAW",
+                        "data": [
+                            {"range": f"'{sheet_name}'!A1", "values": [new_headers]}
+                            for sheet_name in data_sheets
+                        ],
+                    })
+                except Exception as e:
+                    print(f"❌ Failed to update headers: {e}")
+
+                # Header formatting rides in one batchUpdate as well
+                automator.batch_format(spreadsheet, [
+                    automator.build_format_request(automator.worksheet(spreadsheet, sheet_name).id,
+                                                   range_to_format, header_format)
+                    for sheet_name in data_sheets
+                ])
+
             print(f"✅ Updated headers in {len(data_sheets)} sheets")
         
         # 3. Add Formulas
         if operations.get('add_formulas', False):
             print("\n🧮 Adding formulas to sheets...")
-            
-            for sheet_name in data_sheets:
-                # Basic formulas (adjust as needed)
-                formulas = {
-                    'D1': '=SUM(B:B)',
-                    'E1': '=AVERAGE(C:C)',
-                    'F1': '=COUNT(A:A)',
-                }
-                
-                for cell, formula in formulas.items():
-                    try:
-                        automator.add_formula(spreadsheet, sheet_name, cell, formula)
-                    except:
-                        pass
-            
-            print(f"✅ Added formulas to {len(data_sheets)} sheets")
+
+            # Basic formulas (adjust as needed); one ValueRange per sheet,
+            # all carried by a single values.batchUpdate call instead of
+            # three worksheet.update round trips per sheet
+            data = [
+                {"range": f"'{sheet_name}'!D1:F1",
+                 "values": [['=SUM(B:B)', '=AVERAGE(C:C)', '=COUNT(A:A)']]}
+                for sheet_name in data_sheets
+            ]
+            try:
+                automator.call_with_retry(spreadsheet.values_batch_update, {
+                    "valueInputOption": "USER_ENTERED",
+                    "data": data,
+                })
+                print(f"✅ Added formulas to {len(data_sheets)} sheets")
+            except Exception as e:
+                print(f"❌ Failed to add formulas: {e}")
         
         # 4. Validate Data
         if operations.get('validate_data', False):
             print("\n✅ Validating data across sheets...")
+
+            # Metrics run per sheet on each sheet's own frame so empty
+            # cells reflect that sheet's real schema — a concat across
+            # different schemas would count its alignment NaNs as data.
             validation_results = []
-            
+            validation_date = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
             for sheet_name in data_sheets:
-                df = automator.read_sheet_data(spreadsheet, sheet_name)
-                if not df.empty:
-                    validation = {
-                        'sheet_name': sheet_name,
-                        'total_rows': len(df),
-                        'empty_cells': df.isnull().sum().sum(),
-                        'duplicate_rows': df.duplicated().sum(),
-                        'validation_date': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-                    }
-                    validation_results.append(validation)
-            
+                df = sheet_data[sheet_name]
+                if df.empty:
+                    continue
+                validation_results.append({
+                    'sheet_name': sheet_name,
+                    'total_rows': len(df),
+                    'empty_cells': int(df.isnull().sum().sum()),
+                    'duplicate_rows': int(df.duplicated().sum()),
+                    'validation_date': validation_date,
+                })
+
             if validation_results:
                 validation_df = pd.DataFrame(validation_results)
-                try:
+                if "Validation_Report" not in all_sheets:
                     automator.create_new_sheet(spreadsheet, "Validation_Report")
-                except:
-                    pass
                 
                 automator.write_sheet_data(spreadsheet, "Validation_Report", validation_df)
-                print(f"✅ Created validation report for {len(validation_results)} sheets")
+                print(f"✅ Created validation report for {len(validation_df)} sheets")
         
         # 5. Export to CSV
         if operations.get('export_csv', False):
@@ -11,7 +11,8 @@ Common use cases included:
 4. Data validation across sheets
 """
 
-from google_sheets_automation import GoogleSheetsAutomator
+from google_sheets_automation import get_automator
+from gspread.utils import rowcol_to_a1
 import pandas as pd
 from datetime import datetime
 import json
@@ -38,41 +39,50 @@ def setup_credentials():
     print(instructions)
     return "google_sheets_credentials.json"
 
-def consolidate_data_from_multiple_sheets(automator, spreadsheet):
+def consolidate_data_from_multiple_sheets(automator, spreadsheet, sheet_names=None,
+                                          sheet_data=None):
     """
     Example: Consolidate data from multiple sheets into a summary sheet.
     """
     print("\n📊 CONSOLIDATING DATA FROM MULTIPLE SHEETS")
     print("-" * 50)
-    
-    # Get all sheet names
-    sheet_names = automator.list_all_sheets(spreadsheet)
-    
+
+    # Callers that already listed the sheets pass the list in so a
+    # full main() run fetches the metadata once, not per helper
+    if sheet_names is None:
+        sheet_names = automator.list_all_sheets(spreadsheet)
+
     # Filter out summary sheet if it exists
     data_sheets = [name for name in sheet_names if name.lower() != 'summary']
-    
+
     consolidated_data = []
-    
-    # Read data from each sheet
+
+    # One values.batchGet fetches every sheet in a single round trip
+    # instead of one read_sheet_data call (and quota unit) per sheet;
+    # main() passes the dict in so validation can reuse the same fetch
+    if sheet_data is None:
+        print(f"📖 Reading data from: {', '.join(data_sheets)}")
+        sheet_data = automator.batch_read_sheets(spreadsheet, data_sheets)
+    today_str = datetime.now().strftime('%Y-%m-%d')
+
     for sheet_name in data_sheets:
-        print(f"📖 Reading data from: {sheet_name}")
-        df = automator.read_sheet_data(spreadsheet, sheet_name)
-        
+        df = sheet_data[sheet_name]
+
         if not df.empty:
-            # Add source sheet column
-            df['source_sheet'] = sheet_name
-            df['processed_date'] = datetime.now().strftime('%Y-%m-%d')
-            consolidated_data.append(df)
+            # assign leaves the shared frames untouched for later helpers
+            consolidated_data.append(df.assign(
+                source_sheet=sheet_name,
+                processed_date=today_str,
+            ))
     
     # Combine all data
     if consolidated_data:
         combined_df = pd.concat(consolidated_data, ignore_index=True)
         
-        # Create or update summary sheet
-        try:
+        # Create the summary sheet only when the cached listing says it
+        # is missing; the common exists path costs no write request
+        if "Summary" not in sheet_names:
             automator.create_new_sheet(spreadsheet, "Summary")
-        except:
-            print("📝 Summary sheet already exists, updating...")
         
         # Write consolidated data
         automator.write_sheet_data(spreadsheet, "Summary", combined_df)
@@ -88,120 +98,147 @@ def consolidate_data_from_multiple_sheets(automator, spreadsheet):
     
     return combined_df if consolidated_data else pd.DataFrame()
 
-def bulk_update_headers(automator, spreadsheet, new_headers):
+def bulk_update_headers(automator, spreadsheet, new_headers, sheet_names=None):
     """
     Example: Update headers across multiple sheets.
     """
     print("\n🔄 BULK UPDATING HEADERS")
     print("-" * 30)
     
-    sheet_names = automator.list_all_sheets(spreadsheet)
-    
-    for sheet_name in sheet_names:
-        if sheet_name.lower() != 'summary':  # Skip summary sheet
-            print(f"📝 Updating headers in: {sheet_name}")
-            
-            # Update headers
-            header_updates = []
-            for i, header in enumerate(new_headers):
-                col_letter = chr(65 + i)  # A, B, C, etc.
-                header_updates.append([header])
-            
-            # Update each header cell
-            for i, header in enumerate(new_headers):
-                col_letter = chr(65 + i)
-                cell = f"{col_letter}1"
-                try:
-                    worksheet = spreadsheet.worksheet(sheet_name)
-                    worksheet.update(cell, header)
-                except Exception as e:
-                    print(f"⚠️ Couldn't update {cell} in {sheet_name}: {e}")
-            
-            # Format headers
-            header_format = {
-                'backgroundColor': {'red': 0.9, 'green': 0.9, 'blue': 0.9},
-                'textFormat': {'bold': True}
-            }
-            range_to_format = f"A1:{chr(65 + len(new_headers) - 1)}1"
-            automator.format_cells(spreadsheet, sheet_name, range_to_format, header_format)
-
-def add_formulas_to_multiple_sheets(automator, spreadsheet):
+    if sheet_names is None:
+        sheet_names = automator.list_all_sheets(spreadsheet)
+    target_sheets = [name for name in sheet_names if name.lower() != 'summary']
+
+    if not new_headers or not target_sheets:
+        return
+
+    # rowcol_to_a1 stays correct past column Z, where chr(65 + i)
+    # silently produced garbage ranges
+    header_range = f"A1:{rowcol_to_a1(1, len(new_headers))}"
+    print(f"📝 Updating headers in: {', '.join(target_sheets)}")
+
+    # One values.batchUpdate writes every sheet's full header row,
+    # replacing one HTTP round trip per cell per sheet
+    try:
+        automator.call_with_retry(spreadsheet.values_batch_update, {
+            "valueInputOption": "RAW",
+            "data": [
+                {"range": f"'{sheet_name}'!A1", "values": [new_headers]}
+                for sheet_name in target_sheets
+            ],
+        })
+    except Exception as e:
+        print(f"⚠️ Couldn't update headers: {e}")
+        return
+
+    # Header formatting for all sheets rides in one batchUpdate as well
+    header_format = {
+        'backgroundColor': {'red': 0.9, 'green': 0.9, 'blue': 0.9},
+        'textFormat': {'bold': True}
+    }
+    automator.batch_format(spreadsheet, [
+        automator.build_format_request(automator.worksheet(spreadsheet, sheet_name).id,
+                                       header_range, header_format)
+        for sheet_name in target_sheets
+    ])
+
+def add_formulas_to_multiple_sheets(automator, spreadsheet, sheet_names=None):
     """
     Example: Add calculation formulas to multiple sheets.
     """
     print("\n🧮 ADDING FORMULAS TO MULTIPLE SHEETS")
     print("-" * 40)
     
-    sheet_names = automator.list_all_sheets(spreadsheet)
-    
-    for sheet_name in sheet_names:
-        if sheet_name.lower() != 'summary':
-            print(f"📐 Adding formulas to: {sheet_name}")
-            
-            # Example formulas (adjust based on your data structure)
-            formulas = {
-                'D1': '=SUM(B:B)',  # Sum of column B
-                'E1': '=AVERAGE(C:C)',  # Average of column C
-                'F1': '=COUNT(A:A)',  # Count of non-empty cells in column A
-            }
-            
-            for cell, formula in formulas.items():
-                automator.add_formula(spreadsheet, sheet_name, cell, formula)
+    if sheet_names is None:
+        sheet_names = automator.list_all_sheets(spreadsheet)
 
-def validate_data_across_sheets(automator, spreadsheet):
+    target_sheets = [name for name in sheet_names if name.lower() != 'summary']
+    if not target_sheets:
+        return
+
+    print(f"📐 Adding formulas to: {', '.join(target_sheets)}")
+
+    # Example formulas (adjust based on your data structure): sum of
+    # column B, average of column C, count of column A. One ValueRange
+    # per sheet, all carried by a single values.batchUpdate instead of
+    # three add_formula round trips per sheet.
+    data = [
+        {"range": f"'{sheet_name}'!D1:F1",
+         "values": [['=SUM(B:B)', '=AVERAGE(C:C)', '=COUNT(A:A)']]}
+        for sheet_name in target_sheets
+    ]
+    try:
+        automator.call_with_retry(spreadsheet.values_batch_update, {
+            "valueInputOption": "USER_ENTERED",
+            "data": data,
+        })
+    except Exception as e:
+        print(f"⚠️ Couldn't add formulas: {e}")
+
+def validate_data_across_sheets(automator, spreadsheet, sheet_names=None, sheet_data=None):
     """
     Example: Validate data consistency across sheets.
     """
     print("\n✅ VALIDATING DATA ACROSS SHEETS")
     print("-" * 35)
-    
-    sheet_names = automator.list_all_sheets(spreadsheet)
+
+    if sheet_names is None:
+        sheet_names = automator.list_all_sheets(spreadsheet)
+    data_sheets = [name for name in sheet_names if name.lower() != 'summary']
+
+    # Reuse the frames consolidation already fetched; only a standalone
+    # call re-reads the sheets, and then via one values.batchGet.
+    if sheet_data is None:
+        sheet_data = automator.batch_read_sheets(spreadsheet, data_sheets)
+
+    # Metrics run per sheet on each sheet's own frame — empty cells and
+    # missing columns must reflect that sheet's real schema, not NaNs
+    # introduced by aligning different schemas in a concat.
     validation_results = []
-    
-    for sheet_name in sheet_names:
-        if sheet_name.lower() != 'summary':
-            print(f"🔍 Validating: {sheet_name}")
-            df = automator.read_sheet_data(spreadsheet, sheet_name)
-            
-            if not df.empty:
-                # Example validations
-                validation = {
-                    'sheet_name': sheet_name,
-                    'total_rows': len(df),
-                    'empty_cells': df.isnull().sum().sum(),
-                    'duplicate_rows': df.duplicated().sum(),
-                    'validation_date': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-                }
-                
-                # Check for required columns (adjust as needed)
-                required_columns = ['Name', 'Email', 'Amount']  # Example columns
-                missing_columns = [col for col in required_columns if col not in df.columns]
-                validation['missing_columns'] = ', '.join(missing_columns) if missing_columns else 'None'
-                
-                validation_results.append(validation)
-    
+    validation_date = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+    required_columns = ['Name', 'Email', 'Amount']  # Example columns
+
+    for sheet_name in data_sheets:
+        df = sheet_data[sheet_name]
+        if df.empty:
+            continue
+        print(f"🔍 Validating: {sheet_name}")
+
+        validation = {
+            'sheet_name': sheet_name,
+            'total_rows': len(df),
+            'empty_cells': int(df.isnull().sum().sum()),
+            'duplicate_rows': int(df.duplicated().sum()),
+            'validation_date': validation_date,
+        }
+
+        # Check for required columns (adjust as needed)
+        missing_columns = [col for col in required_columns if col not in df.columns]
+        validation['missing_columns'] = ', '.join(missing_columns) if missing_columns else 'None'
+
+        validation_results.append(validation)
+
     # Create validation report
     if validation_results:
         validation_df = pd.DataFrame(validation_results)
-        
-        try:
+
+        if "Validation_Report" not in sheet_names:
             automator.create_new_sheet(spreadsheet, "Validation_Report")
-        except:
-            print("📝 Validation report sheet already exists, updating...")
-        
+
         automator.write_sheet_data(spreadsheet, "Validation_Report", validation_df)
         print(f"✅ Created validation report with {len(validation_results)} sheet validations")
-    
+
     return validation_results
 
-def export_filtered_data(automator, spreadsheet, filter_criteria):
+def export_filtered_data(automator, spreadsheet, filter_criteria, sheet_names=None):
     """
     Example: Export filtered data from multiple sheets.
     """
     print("\n📤 EXPORTING FILTERED DATA")
     print("-" * 30)
     
-    sheet_names = automator.list_all_sheets(spreadsheet)
+    if sheet_names is None:
+        sheet_names = automator.list_all_sheets(spreadsheet)
     
     for sheet_name in sheet_names:
         if sheet_name.lower() not in ['summary', 'validation_report']:
@@ -216,7 +253,8 @@ def export_filtered_data(automator, spreadsheet, filter_criteria):
                         # Create new sheet with filtered data
                         filtered_sheet_name = f"{sheet_name}_Filtered"
                         try:
-                            automator.create_new_sheet(spreadsheet, filtered_sheet_name)
+                            if filtered_sheet_name not in sheet_names:
+                                automator.create_new_sheet(spreadsheet, filtered_sheet_name)
                             automator.write_sheet_data(spreadsheet, filtered_sheet_name, filtered_df)
                             print(f"✅ Created filtered sheet: {filtered_sheet_name}")
                         except Exception as e:
@@ -240,7 +278,7 @@ def main():
     
     try:
         # Initialize automator
-        automator = GoogleSheetsAutomator(credentials_file)
+        automator = get_automator(credentials_file)
         
         # Open spreadsheet
         spreadsheet = automator.open_spreadsheet(spreadsheet_id)
@@ -250,25 +288,35 @@ def main():
             return
         
         print(f"\n📊 Working with spreadsheet: {spreadsheet.title}")
-        
+
+        # List the sheets once up front; every helper below reuses this
+        # instead of refetching the spreadsheet metadata
+        sheet_names = automator.list_all_sheets(spreadsheet)
+
+        # One batched read shared by consolidation and validation
+        data_sheets = [name for name in sheet_names if name.lower() != 'summary']
+        sheet_data = automator.batch_read_sheets(spreadsheet, data_sheets)
+
         # Example operations (uncomment the ones you need)
-        
+
         # 1. Consolidate data from multiple sheets
-        consolidated_data = consolidate_data_from_multiple_sheets(automator, spreadsheet)
+        consolidated_data = consolidate_data_from_multiple_sheets(automator, spreadsheet,
+                                                                  sheet_names, sheet_data)
         
         # 2. Update headers across sheets
         new_headers = ['Name', 'Email', 'Amount', 'Date', 'Status']
-        bulk_update_headers(automator, spreadsheet, new_headers)
+        bulk_update_headers(automator, spreadsheet, new_headers, sheet_names)
         
         # 3. Add formulas to sheets
-        add_formulas_to_multiple_sheets(automator, spreadsheet)
+        add_formulas_to_multiple_sheets(automator, spreadsheet, sheet_names)
         
         # 4. Validate data across sheets
-        validation_results = validate_data_across_sheets(automator, spreadsheet)
+        validation_results = validate_data_across_sheets(automator, spreadsheet, sheet_names,
+                                                         sheet_data)
         
         # 5. Export filtered data
         filter_criteria = {'min_amount': 1000}
-        export_filtered_data(automator, spreadsheet, filter_criteria)
+        export_filtered_data(automator, spreadsheet, filter_criteria, sheet_names)
         
         # 6. Export all sheets to CSV
         automator.export_sheets_to_csv(spreadsheet, "./sheet_exports")
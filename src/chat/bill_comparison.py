@@ -1,17 +1,24 @@
-def compare_bills(bills):
-    if len(bills) < 4:
-        return "Not enough bills to compare."
-
-    last_four_bills = bills[-4:]
-    comparison_results = {}
-
-    for i in range(1, len(last_four_bills)):
-        previous_bill = last_four_bills[i - 1]
-        current_bill = last_four_bills[i]
-        comparison_results[f'Comparison between Bill {i} and Bill {i + 1}'] = {
-            'Previous Bill Amount': previous_bill['amount'],
-            'Current Bill Amount': current_bill['amount'],
-            'Difference': current_bill['amount'] - previous_bill['amount']
-        }
-
-    return comparison_results
\ No newline at end of file
+import numpy as np
+
+def compare_bills(bills):
+    if len(bills) < 4:
+        return "Not enough bills to compare."
+
+    # One contiguous float64 pass; np.diff does the per-pair arithmetic
+    # in C instead of dict lookups inside a Python loop.
+    amounts = np.fromiter((bill['amount'] for bill in bills[-4:]), dtype=np.float64)
+    diffs = np.diff(amounts)
+
+    # A list of plain records, one per consecutive pair; no per-pair
+    # f-string key to build or parse back.
+    return [
+        {
+            'previous_bill': i,
+            'current_bill': i + 1,
+            'previous_amount': previous,
+            'current_amount': current,
+            'difference': difference,
+        }
+        for i, (previous, current, difference)
+        in enumerate(zip(amounts[:-1], amounts[1:], diffs), start=1)
+    ]
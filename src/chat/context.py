@@ -1,19 +1,31 @@
-class ChatContext:
-    def __init__(self):
-        self.messages = []
-        self.user_info = {}
-
-    def add_message(self, role, content):
-        self.messages.append({"role": role, "content": content})
-
-    def get_context(self):
-        return self.messages
-
-    def set_user_info(self, user_info):
-        self.user_info = user_info
-
-    def get_user_info(self):
-        return self.user_info
-
-    def clear_context(self):
-        self.messages = []
\ No newline at end of file
+import collections
+
+MAX_CONTEXT_MESSAGES = 50
+
+class ChatContext:
+    def __init__(self):
+        # Parallel bounded deques, one per field, instead of an unbounded
+        # list of per-message dicts: memory stays constant for long
+        # sessions and each append allocates no dict object.
+        self.roles = collections.deque(maxlen=MAX_CONTEXT_MESSAGES)
+        self.contents = collections.deque(maxlen=MAX_CONTEXT_MESSAGES)
+        self.user_info = {}
+
+    def add_message(self, role, content):
+        self.roles.append(role)
+        self.contents.append(content)
+
+    def get_context(self):
+        # Materialize the dict shape only when a caller needs it.
+        return [{"role": role, "content": content}
+                for role, content in zip(self.roles, self.contents)]
+
+    def set_user_info(self, user_info):
+        self.user_info = user_info
+
+    def get_user_info(self):
+        return self.user_info
+
+    def clear_context(self):
+        self.roles.clear()
+        self.contents.clear()
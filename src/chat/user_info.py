@@ -1,9 +1,31 @@
-class UserInfo:
-    def __init__(self):
-        self.user_data = {}
-    
-    def save_user_info(self, user_id, info):
-        self.user_data[user_id] = info
-    
-    def get_user_info(self, user_id):
-        return self.user_data.get(user_id, None)
\ No newline at end of file
+import functools
+import json
+import os
+
+@functools.lru_cache(maxsize=32)
+def _read_user_file(file_path, mtime_ns):
+    # Keyed on mtime so Streamlit reruns reuse the parsed dict while a
+    # rewritten file still invalidates the cache.
+    with open(file_path, 'r') as file:
+        return json.load(file)
+
+class UserInfo:
+    def __init__(self):
+        self.user_data = {}
+
+    def save_user_info(self, user_id, info):
+        self.user_data[user_id] = info
+
+    def get_user_info(self, user_id):
+        return self.user_data.get(user_id, None)
+
+    def load_user_data(self, user_id):
+        file_path = os.path.join("data", "user_data", f"user_data_{user_id}.json")
+        try:
+            mtime_ns = os.stat(file_path).st_mtime_ns
+        except FileNotFoundError:
+            data = {}
+        else:
+            data = _read_user_file(file_path, mtime_ns)
+        self.user_data[user_id] = data
+        return data